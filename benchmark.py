@@ -0,0 +1,256 @@
+"""
+Headless Pipeline Benchmark
+Runs HandDetector -> GestureRecognizer -> SystemController over a frame
+source without the GUI and reports throughput, latency and CPU use
+
+Examples:
+    python benchmark.py --source synthetic --frames 300
+    python benchmark.py --source video --path clip.mp4 --output run.json
+    python benchmark.py --source images --path frames/ --realtime --fps 30
+
+Comparing detector backends on the same clip:
+    python benchmark.py --source video --path clip.mp4 --record clip_landmarks.json
+    python benchmark.py --source video --path clip.mp4 \
+        --backends solutions:0,solutions:1,tasks:video,replay --replay clip_landmarks.json
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from collections import Counter
+
+import cv2
+
+from modules.detector_backends import save_recording
+from modules.hand_detector import HandDetector
+from modules.gesture_recognizer import GestureRecognizer
+from modules.system_controller import SystemController
+from modules.frame_capture import LatestFrameMailbox, CaptureWorker
+from modules.frame_sources import create_frame_source
+from modules.landmark_predictor import LandmarkPredictor
+from utils.logger import logger
+from utils.profiler import profiler
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline")
+    parser.add_argument('--config', default='config.json', help="Configuration file")
+    parser.add_argument('--source', default='synthetic',
+                        choices=['webcam', 'video', 'images', 'synthetic'])
+    parser.add_argument('--path', help="Video file or image directory")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Pace frames at their original rate instead of as fast as possible")
+    parser.add_argument('--fps', type=float, help="Frame rate for image/synthetic sources")
+    parser.add_argument('--frames', type=int, help="Stop after this many frames")
+    parser.add_argument('--mode', default='slide', help="Control mode for action mapping")
+    parser.add_argument('--output', help="Write results as JSON for comparison across builds")
+    parser.add_argument('--backends',
+                        help="Comma-separated detector backends to compare, e.g. "
+                             "solutions:0,solutions:1,tasks:video,tasks:live_stream,replay")
+    parser.add_argument('--model-path', default='models/hand_landmarker.task',
+                        help="Model bundle for the tasks backend")
+    parser.add_argument('--replay', help="Landmark recording for the replay backend")
+    parser.add_argument('--record', help="Save detected landmarks for later replay")
+    return parser.parse_args()
+
+
+def build_config(args):
+    """Load config.json and override the frame source"""
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    source = {'type': args.source}
+
+    if args.path:
+        source['path'] = args.path
+    if args.source == 'video':
+        source['realtime'] = args.realtime
+    if args.source in ('images', 'synthetic') and args.realtime:
+        source['fps'] = args.fps or config['camera']['fps']
+    if args.source == 'synthetic' and args.frames:
+        source['num_frames'] = args.frames
+
+    config['camera']['source'] = source
+    config['system_control']['dry_run'] = True
+    return config
+
+
+def backend_config(spec, args):
+    """Turn a --backends entry (type[:option]) into a hand_detection.backend section"""
+    backend_type, _, option = spec.strip().partition(':')
+
+    if backend_type == 'solutions':
+        return {'type': 'solutions', 'model_complexity': int(option or 1)}
+    if backend_type == 'tasks':
+        return {'type': 'tasks', 'model_path': args.model_path,
+                'running_mode': option or 'video'}
+    if backend_type == 'replay':
+        if not args.replay:
+            raise ValueError("The replay backend needs --replay")
+        return {'type': 'replay', 'path': args.replay}
+    raise ValueError(f"Unknown backend: {spec}")
+
+
+def run_benchmark(config, max_frames=None, mode='slide', recording=None):
+    """
+    Drive the full pipeline over the configured source
+    Args:
+        recording: Optional list that receives each frame's raw landmarks
+    Returns: dict of results
+    """
+    hand_detector = HandDetector(config)
+    hand_detector.warm_up(config['camera']['width'], config['camera']['height'],
+                          config['hand_detection'].get('warmup_frames', 3))
+    gesture_recognizer = GestureRecognizer(config)
+    predictor = LandmarkPredictor(config)
+    profiler.configure(enabled=True, window=max_frames or 10000, log_interval=0)
+    system_controller = SystemController(config)
+    system_controller.set_mode(mode)
+
+    source = create_frame_source(config)
+    if not source.open():
+        raise RuntimeError(f"Failed to open {source.describe()}")
+
+    mailbox = LatestFrameMailbox(drop_stale=source.is_live)
+    worker = CaptureWorker(source, mailbox)
+
+    frames = 0
+    frames_with_hands = 0
+    gestures = []
+    frame_times = []
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    worker.start()
+
+    try:
+        while max_frames is None or frames < max_frames:
+            item = mailbox.get(timeout=1.0)
+            if item is None:
+                if mailbox.is_closed:
+                    break
+                continue
+
+            frame, capture_time, sequence = item
+            t0 = time.perf_counter()
+
+            frame = cv2.flip(frame, 1)
+            _, hands_data = hand_detector.process_frame(frame, capture_time)
+
+            if recording is not None:
+                recording.append([(hand['label'], hand['raw_landmarks'].array.copy())
+                                  for hand in hands_data])
+
+            if hands_data:
+                frames_with_hands += 1
+                with profiler.stage('recognition'):
+                    predictor.update(hands_data, capture_time)
+                    gesture_name, confidence = gesture_recognizer.recognize_gesture(hands_data, capture_time)
+                if gesture_name:
+                    system_controller.execute_gesture(gesture_name)
+                    gestures.append({'sequence': sequence, 'gesture': gesture_name,
+                                     'confidence': round(float(confidence), 3)})
+
+            frame_times.append(time.perf_counter() - t0)
+            frames += 1
+    finally:
+        worker.stop()
+        source.release()
+        hand_detector.release()
+
+    elapsed = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start  # All threads of this process
+    frame_times.sort()
+
+    def percentile(p):
+        if not frame_times:
+            return 0.0
+        return frame_times[min(len(frame_times) - 1, int(p * len(frame_times)))] * 1000
+
+    return {
+        'source': source.describe(),
+        'backend': hand_detector.backend.describe(),
+        'frames_processed': frames,
+        'frames_dropped': mailbox.frames_dropped,
+        'frames_with_hands': frames_with_hands,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_fps': round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'frame_ms_p50': round(percentile(0.50), 2),
+        'frame_ms_p95': round(percentile(0.95), 2),
+        'frame_ms_p99': round(percentile(0.99), 2),
+        'cpu_percent': round(100 * cpu_time / elapsed, 1) if elapsed > 0 else 0.0,
+        'cpu_ms_per_frame': round(1000 * cpu_time / frames, 2) if frames else 0.0,
+        'stages': profiler.summary(),
+        'gesture_counts': dict(Counter(g['gesture'] for g in gestures)),
+        'gestures': gestures,
+        'actions': system_controller.get_action_history(len(gestures)) if gestures else []
+    }
+
+
+def print_results(results):
+    print(f"Source:            {results['source']}")
+    print(f"Backend:           {results['backend']}")
+    print(f"Frames processed:  {results['frames_processed']}")
+    print(f"Frames dropped:    {results['frames_dropped']}")
+    print(f"Frames with hands: {results['frames_with_hands']}")
+    print(f"Throughput:        {results['throughput_fps']} FPS")
+    print(f"Frame time p50:    {results['frame_ms_p50']} ms")
+    print(f"Frame time p95:    {results['frame_ms_p95']} ms")
+    print(f"Frame time p99:    {results['frame_ms_p99']} ms")
+    print(f"CPU:               {results['cpu_percent']}% ({results['cpu_ms_per_frame']} ms/frame)")
+    print(f"Gestures:          {results['gesture_counts']}")
+    print(f"{'Stage':<19}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for name, values in results['stages'].items():
+        print(f"  {name:<17}{values['p50_ms']:>9.2f}{values['p95_ms']:>9.2f}{values['p99_ms']:>9.2f}")
+
+
+def compare_backends(config, args):
+    """Run the benchmark once per backend on the same source"""
+    runs = []
+    for spec in args.backends.split(','):
+        run_config = copy.deepcopy(config)
+        run_config['hand_detection']['backend'] = backend_config(spec, args)
+
+        logger.info(f"Benchmarking backend '{spec}'...")
+        runs.append(run_benchmark(run_config, max_frames=args.frames, mode=args.mode))
+
+    print(f"Source: {runs[0]['source']}")
+    print(f"{'Backend':<34}{'FPS':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'CPU%':>8}{'CPU ms':>8}{'Hands':>7}")
+    for run in runs:
+        print(
+            f"{run['backend']:<34}{run['throughput_fps']:>8.1f}{run['frame_ms_p50']:>8.2f}"
+            f"{run['frame_ms_p95']:>8.2f}{run['frame_ms_p99']:>8.2f}{run['cpu_percent']:>8.1f}"
+            f"{run['cpu_ms_per_frame']:>8.2f}{run['frames_with_hands']:>7}"
+        )
+    return {'runs': runs}
+
+
+def main():
+    args = parse_args()
+    config = build_config(args)
+
+    if args.backends:
+        results = compare_backends(config, args)
+    else:
+        logger.info(f"Benchmarking pipeline on '{args.source}' source...")
+        recording = [] if args.record else None
+        results = run_benchmark(config, max_frames=args.frames, mode=args.mode,
+                                recording=recording)
+        print_results(results)
+
+        if args.record:
+            save_recording(args.record, recording)
+            print(f"Landmarks recorded to {args.record}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
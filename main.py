@@ -1,30 +1,43 @@
 """
 Main Application Entry Point
 AI Gesture Control System with Voice Recognition
+
+Heavy dependencies (OpenCV, MediaPipe, scikit-learn, pyautogui, speech) are
+imported when the subsystem that needs them is first used, so the window
+appears quickly; the startup timing report shows where the time goes.
 """
 
+import time
+STARTUP_START = time.perf_counter()
+
 import sys
 import json
-import cv2
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from PyQt5.QtGui import QIcon
 
-from modules.hand_detector import HandDetector
-from modules.gesture_recognizer import GestureRecognizer
-from modules.system_controller import SystemController, ControlMode
-from modules.voice_controller import VoiceController
+from modules.landmark_predictor import LandmarkPredictor
+from modules.landmarks import overlay_points
 from ui.main_window import MainWindow
 from utils.logger import logger
+from utils.profiler import profiler, StartupTimer
+
+startup = StartupTimer(STARTUP_START)
+startup.mark('imports')
+
+# Budget for process start -> window visible
+STARTUP_TARGET = 1.0
 
 
 class GestureControlThread(QThread):
     """Background thread for gesture processing"""
     
-    frame_ready = pyqtSignal(object)  # Processed frame
+    frame_ready = pyqtSignal(object, object)  # Frame, hand overlays (None = no overlay)
     gesture_detected = pyqtSignal(str, float)  # Gesture name, confidence
     hands_detected = pyqtSignal(int)  # Number of hands
     fps_updated = pyqtSignal(int)  # FPS value
+    camera_status = pyqtSignal(str)  # opening/unavailable/healthy/stalled/lost/failed
+    idle_changed = pyqtSignal(bool)  # Entered / left idle mode
     
     def __init__(self, config, hand_detector, gesture_recognizer):
         super().__init__()
@@ -32,58 +45,148 @@ class GestureControlThread(QThread):
         self.hand_detector = hand_detector
         self.gesture_recognizer = gesture_recognizer
         self.is_running = False
-        self.cap = None
+        self.source = None
+        self.capture_worker = None
+        self.mailbox = None
+        self.idle_monitor = None
+        self.inference_pool = None
+        self.predictor = LandmarkPredictor(config)
     
     def run(self):
         """Main processing loop"""
         logger.info("Starting gesture control thread...")
         
-        # Initialize camera
-        self.cap = cv2.VideoCapture(0)
-        
-        if not self.cap.isOpened():
-            logger.error("Failed to open camera")
-            # Try alternative camera indices
-            for i in range(1, 3):
-                logger.info(f"Trying camera index {i}...")
-                self.cap = cv2.VideoCapture(i)
-                if self.cap.isOpened():
-                    break
-        
-        if not self.cap.isOpened():
-            logger.error("No camera available!")
+        # Deferred imports: only needed once detection runs
+        import cv2
+        from modules.frame_capture import LatestFrameMailbox, CaptureWorker
+        from modules.frame_sources import create_frame_source
+        from modules.idle_monitor import IdleMonitor
+        from modules.inference_pool import InferencePool
+        
+        # Initialize frame source (webcam unless configured otherwise)
+        # Opening happens on this thread so the UI stays responsive
+        start_time = time.monotonic()
+        self.camera_status.emit('opening')
+        self.source = create_frame_source(self.config)
+        
+        if not self.source.open():
+            logger.error(f"Failed to open {self.source.describe()}")
+            self.camera_status.emit('unavailable')
             return
         
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config['camera']['width'])
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config['camera']['height'])
-        self.cap.set(cv2.CAP_PROP_FPS, self.config['camera']['fps'])
-        
         self.is_running = True
-        logger.info("Camera initialized successfully")
+        logger.info(f"Frame source initialized: {self.source.describe()}")
+        
+        # Capture runs on its own thread; we only ever process the newest frame
+        self.mailbox = LatestFrameMailbox(drop_stale=self.source.is_live)
+        self.capture_worker = CaptureWorker(
+            self.source,
+            self.mailbox,
+            recovery_config=self.config['camera'].get('recovery'),
+            status_callback=self.camera_status.emit
+        )
+        self.capture_worker.start()
+        
+        # Optional multi-process detection
+        num_workers = self.config['hand_detection'].get('inference_workers', 0)
+        if num_workers > 0:
+            self.inference_pool = InferencePool(self.config, num_workers)
+            self.inference_pool.start()
+        
+        # Idle mode only makes sense for live cameras
+        self.idle_monitor = IdleMonitor(self.config)
+        self.idle_monitor.enabled = self.idle_monitor.enabled and self.source.is_live
+        
+        profiling_config = self.config.get('profiling', {})
+        profiler.configure(
+            enabled=profiling_config.get('enabled', True),
+            window=profiling_config.get('window', 300),
+            log_interval=profiling_config.get('log_interval', 30.0)
+        )
         
+        first_frame = True
         while self.is_running:
-            ret, frame = self.cap.read()
+            with profiler.stage('capture_wait'):
+                item = self.mailbox.get(timeout=0.5)
             
-            if not ret:
-                logger.warning("Failed to read frame from camera")
+            if item is None:
+                if self.mailbox.is_closed:
+                    break  # Offline source ran out of frames
                 continue
             
-            # Flip frame horizontally for mirror effect
-            frame = cv2.flip(frame, 1)
+            frame, capture_time, sequence = item
+            frame_start = time.perf_counter()
             
-            # Process frame with hand detector
-            processed_frame, hands_data = self.hand_detector.process_frame(frame)
+            if first_frame:
+                first_frame = False
+                logger.info(f"Time to first frame: {(capture_time - start_time) * 1000:.0f} ms")
+                self.camera_status.emit('healthy')
             
-            # Emit hands detected count
-            self.hands_detected.emit(len(hands_data))
+            # Flip frame horizontally for mirror effect
+            with profiler.stage('flip'):
+                frame = cv2.flip(frame, 1)
             
-            # Recognize gesture if hands detected
-            gesture_name = None
-            confidence = 0.0
+            # While idle, only a cheap motion check runs on each frame
+            if self.idle_monitor.is_idle:
+                if not self.idle_monitor.check_motion(frame):
+                    self.frame_ready.emit(frame, None)
+                    continue
+                self.capture_worker.set_low_power(False)
+                self.idle_changed.emit(False)
             
-            if hands_data:
-                gesture_name, confidence = self.gesture_recognizer.recognize_gesture(hands_data)
+            if self.inference_pool:
+                # Detection runs in worker processes; results come back in order
+                try:
+                    with profiler.stage('pool'):
+                        self.inference_pool.submit(frame, capture_time)
+                        results = self.inference_pool.collect()
+                except RuntimeError as e:
+                    if self.is_running:
+                        logger.error(f"Inference pool failed: {e}")
+                        self.camera_status.emit('failed')
+                    break
+                for done_frame, done_time, hands_data in results:
+                    self._publish(done_frame, hands_data, self.inference_pool.get_fps(), done_time)
+            else:
+                # Process frame with hand detector
+                processed_frame, hands_data = self.hand_detector.process_frame(frame, capture_time)
+                self._publish(processed_frame, hands_data, self.hand_detector.get_fps(), capture_time)
             
+            profiler.record('frame', time.perf_counter() - frame_start)
+            profiler.maybe_log()
+        
+        # Cleanup
+        self.capture_worker.stop()
+        self.source.release()
+        if self.inference_pool:
+            self.inference_pool.release()
+        logger.info(
+            f"Frames captured: {self.mailbox.frames_put}, "
+            f"dropped as stale: {self.mailbox.frames_dropped}, "
+            f"last delivery rate: {self.capture_worker.delivery_fps:.1f} fps"
+        )
+        logger.info("Gesture control thread stopped")
+    
+    def _publish(self, processed_frame, hands_data, fps, capture_time):
+        """Recognize gestures for a processed frame and emit the results"""
+        # Emit hands detected count
+        self.hands_detected.emit(len(hands_data))
+        
+        if self.idle_monitor.update(len(hands_data)):
+            self.capture_worker.set_low_power(True, self.idle_monitor.idle_fps)
+            self.idle_changed.emit(True)
+        
+        # Recognize gesture if hands detected
+        gesture_name = None
+        confidence = 0.0
+        
+        if hands_data:
+            # Judge gestures on positions extrapolated past the pipeline latency
+            with profiler.stage('recognition'):
+                self.predictor.update(hands_data, capture_time)
+                gesture_name, confidence = self.gesture_recognizer.recognize_gesture(hands_data, capture_time)
+        
+        with profiler.stage('emit'):
             # Emit gesture information
             if gesture_name:
                 self.gesture_detected.emit(gesture_name, confidence)
@@ -91,24 +194,52 @@ class GestureControlThread(QThread):
                 self.gesture_detected.emit("", 0.0)
             
             # Emit FPS
-            fps = self.hand_detector.get_fps()
             self.fps_updated.emit(fps)
             
-            # Emit processed frame
-            self.frame_ready.emit(processed_frame)
-        
-        # Cleanup
-        if self.cap:
-            self.cap.release()
-        logger.info("Gesture control thread stopped")
+            # Emit frame; landmarks are drawn by the video widget at display size
+            overlays = overlay_points(hands_data) if self.config['ui']['show_landmarks'] else None
+            self.frame_ready.emit(processed_frame, overlays)
     
     def stop(self):
         """Stop the processing thread"""
         logger.info("Stopping gesture control thread...")
         self.is_running = False
+        if self.mailbox:
+            self.mailbox.close()
+        if self.inference_pool:
+            self.inference_pool.cancel()
         self.wait()
 
 
+class DetectorWarmupThread(QThread):
+    """Builds the hand detector and warms up its graph off the UI thread"""
+    
+    state_changed = pyqtSignal(str)  # loading/ready/failed
+    
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+        self.detector = None
+    
+    def run(self):
+        self.state_changed.emit('loading')
+        try:
+            from modules.hand_detector import HandDetector
+            
+            with startup.measure("hand detector (background)"):
+                detector = HandDetector(self.config)
+                detector.warm_up(
+                    self.config['camera']['width'],
+                    self.config['camera']['height'],
+                    self.config['hand_detection'].get('warmup_frames', 3)
+                )
+            self.detector = detector
+            self.state_changed.emit('ready')
+        except Exception as e:
+            logger.error(f"Hand detector warm-up failed: {e}")
+            self.state_changed.emit('failed')
+
+
 class GestureControlApp:
     """Main application controller"""
     
@@ -118,28 +249,30 @@ class GestureControlApp:
         
         # Load configuration
         self.config = self._load_config()
+        startup.mark('config')
         
-        # Initialize modules
-        logger.info("Initializing hand detector...")
-        self.hand_detector = HandDetector(self.config)
-        
-        logger.info("Initializing gesture recognizer...")
-        self.gesture_recognizer = GestureRecognizer(self.config)
-        
-        logger.info("Initializing system controller...")
-        self.system_controller = SystemController(self.config)
-        
-        logger.info("Initializing voice controller...")
-        self.voice_controller = VoiceController(self.config)
+        # Subsystems are built on first use (see the properties below)
+        self._hand_detector = None
+        self._gesture_recognizer = None
+        self._system_controller = None
+        self._voice_controller = None
         
         # Create GUI
         self.app = QApplication(sys.argv)
+        startup.mark('QApplication')
         self.window = MainWindow(self.config)
+        startup.mark('main window')
         
         # Processing thread
         self.processing_thread = None
         self.voice_thread = None
         
+        # Hand detector warm-up (started once the window is visible)
+        self.warmup_thread = DetectorWarmupThread(self.config)
+        self.warmup_thread.state_changed.connect(self.on_model_state)
+        self.model_state = 'cold'  # cold/loading/ready/failed
+        self.start_pending = False
+        
         # Action counter
         self.actions_executed = 0
         
@@ -151,6 +284,52 @@ class GestureControlApp:
         
         logger.info("Application initialized successfully")
     
+    def _build(self, name, factory):
+        """Construct a subsystem, timing it for the startup report"""
+        logger.info(f"Initializing {name}...")
+        with startup.measure(name):
+            return factory()
+    
+    @property
+    def hand_detector(self):
+        if self._hand_detector is None and self.warmup_thread.isRunning():
+            self.warmup_thread.wait()
+        if self._hand_detector is None and self.warmup_thread.detector is not None:
+            self._hand_detector = self.warmup_thread.detector
+        if self._hand_detector is None:
+            # Warm-up not run or failed - build (cold) on this thread
+            from modules.hand_detector import HandDetector
+            self._hand_detector = self._build("hand detector", lambda: HandDetector(self.config))
+        return self._hand_detector
+    
+    @property
+    def gesture_recognizer(self):
+        if self._gesture_recognizer is None:
+            from modules.gesture_recognizer import GestureRecognizer
+            self._gesture_recognizer = self._build(
+                "gesture recognizer", lambda: GestureRecognizer(self.config)
+            )
+        return self._gesture_recognizer
+    
+    @property
+    def system_controller(self):
+        if self._system_controller is None:
+            from modules.system_controller import SystemController
+            self._system_controller = self._build(
+                "system controller", lambda: SystemController(self.config)
+            )
+        return self._system_controller
+    
+    @property
+    def voice_controller(self):
+        """Opens the microphone and TTS engine, so only built when voice is enabled"""
+        if self._voice_controller is None:
+            from modules.voice_controller import VoiceController
+            self._voice_controller = self._build(
+                "voice controller", lambda: VoiceController(self.config)
+            )
+        return self._voice_controller
+    
     def _load_config(self):
         """Load configuration from JSON file"""
         try:
@@ -181,6 +360,13 @@ class GestureControlApp:
     
     def start_detection(self):
         """Start gesture detection"""
+        if self.model_state == 'loading':
+            # Start as soon as the model is ready instead of blocking the UI
+            logger.info("Detection will start once the hand model is ready")
+            self.start_pending = True
+            self.window.add_log_message("⏳ Starting once the hand model is ready...")
+            return
+        
         logger.info("Starting gesture detection...")
         
         # Create and start processing thread
@@ -195,6 +381,8 @@ class GestureControlApp:
         self.processing_thread.gesture_detected.connect(self.on_gesture_detected)
         self.processing_thread.hands_detected.connect(self.on_hands_detected)
         self.processing_thread.fps_updated.connect(self.on_fps_updated)
+        self.processing_thread.camera_status.connect(self.on_camera_status)
+        self.processing_thread.idle_changed.connect(self.on_idle_changed)
         
         # Start thread
         self.processing_thread.start()
@@ -209,6 +397,7 @@ class GestureControlApp:
     def stop_detection(self):
         """Stop gesture detection"""
         logger.info("Stopping gesture detection...")
+        self.start_pending = False
         
         if self.processing_thread and self.processing_thread.isRunning():
             self.processing_thread.stop()
@@ -230,9 +419,9 @@ class GestureControlApp:
         
         logger.info(f"Mode changed to: {mode}")
     
-    def on_frame_ready(self, frame):
+    def on_frame_ready(self, frame, overlays):
         """Handle processed frame from thread"""
-        self.window.update_video_frame(frame)
+        self.window.update_video_frame(frame, overlays)
     
     def on_gesture_detected(self, gesture_name, confidence):
         """Handle detected gesture"""
@@ -259,10 +448,52 @@ class GestureControlApp:
         """Handle FPS update"""
         self.window.update_fps(fps)
     
+    def on_camera_status(self, status):
+        """Handle camera opening / lost / recovered notifications"""
+        self.window.set_camera_status(status)
+        
+        if status == 'unavailable':
+            self.window.add_log_message("❌ No camera available")
+            self.window.control_panel.set_running(False)
+            self.window.set_status(False)
+        elif status == 'failed':
+            self.window.add_log_message("❌ Hand detection workers stopped")
+            self.window.control_panel.set_running(False)
+            self.window.set_status(False)
+        elif status == 'lost':
+            self.window.add_log_message("⚠ Camera lost - reconnecting...")
+        elif status == 'healthy':
+            self.window.add_log_message("✓ Camera streaming")
+    
+    def on_model_state(self, state):
+        """Handle hand detector warm-up progress"""
+        logger.info(f"Hand model: {state}")
+        self.model_state = state
+        if not self.processing_thread:
+            self.window.set_model_status(state)
+        
+        if state in ('ready', 'failed') and self.start_pending:
+            self.start_pending = False
+            self.start_detection()
+    
+    def on_idle_changed(self, idle):
+        """Handle entering / leaving idle mode"""
+        self.window.set_idle(idle)
+        self.window.add_log_message("🌙 Idle - waiting for motion" if idle else "✓ Motion detected - active")
+    
     def toggle_voice_control(self, enabled):
         """Toggle voice recognition control"""
         if enabled:
             logger.info("Enabling voice control...")
+            
+            # First use builds the voice controller (microphone + TTS engine)
+            try:
+                self.voice_controller
+            except Exception as e:
+                logger.error(f"Voice control unavailable: {e}")
+                self.window.update_voice_status(False, f"Error: {str(e)}")
+                return
+            
             self.voice_enabled = True
             self.window.update_voice_status(False, "🎤 Ready to listen... Speak commands now!")
             self.window.add_log_message("✅ Voice control enabled")
@@ -299,11 +530,22 @@ class GestureControlApp:
         logger.info("Starting application GUI...")
         self.window.show()
         
+        # Runs once the event loop has painted the window
+        QTimer.singleShot(0, self._on_window_visible)
+        
         # Handle application exit
         self.app.aboutToQuit.connect(self.cleanup)
         
         sys.exit(self.app.exec_())
     
+    def _on_window_visible(self):
+        startup.mark('window visible')
+        startup.report(target=STARTUP_TARGET)
+        
+        # Load and warm up the hand model while the user looks at the window
+        self.model_state = 'loading'
+        self.warmup_thread.start()
+    
     def cleanup(self):
         """Cleanup resources before exit"""
         logger.info("Cleaning up resources...")
@@ -311,10 +553,13 @@ class GestureControlApp:
         if self.processing_thread and self.processing_thread.isRunning():
             self.processing_thread.stop()
         
-        if self.voice_controller:
-            self.voice_controller.stop_listening()
+        self.warmup_thread.wait()
+        
+        if self._voice_controller:
+            self._voice_controller.stop_listening()
         
-        self.hand_detector.release()
+        if self._hand_detector:
+            self._hand_detector.release()
         
         logger.info("Application closed successfully")
 
@@ -1,9 +1,22 @@
 """
 Gesture Control System Modules
+Classes are imported on first access so that importing a light submodule
+(e.g. modules.landmarks) does not pull in MediaPipe, scikit-learn or pyautogui
 """
 
-from .hand_detector import HandDetector
-from .gesture_recognizer import GestureRecognizer
-from .system_controller import SystemController, ControlMode
+import importlib
 
-__all__ = ['HandDetector', 'GestureRecognizer', 'SystemController', 'ControlMode']
\ No newline at end of file
+_EXPORTS = {
+    'HandDetector': '.hand_detector',
+    'GestureRecognizer': '.gesture_recognizer',
+    'SystemController': '.system_controller',
+    'ControlMode': '.system_controller',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
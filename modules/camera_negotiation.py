@@ -0,0 +1,122 @@
+"""
+Camera Mode Negotiation
+OpenCV has no API to list a device's modes, so candidate pixel formats and
+resolutions are requested one by one, read back, and their real delivery
+rate measured. Compressed formats are preferred because uncompressed YUYV
+usually cannot reach 30 fps at 1280x720 over USB 2.0.
+"""
+
+import time
+
+import cv2
+
+from modules.camera_profile import fourcc_to_str
+from utils.logger import logger
+
+
+DEFAULT_FOURCCS = ['MJPG', 'YUYV']
+
+FALLBACK_RESOLUTIONS = [(1280, 720), (960, 540), (848, 480), (640, 480)]
+
+
+def apply_mode(cap, fourcc, width, height, fps, buffer_size=1):
+    """
+    Request a mode and read back what the driver accepted
+    Returns: dict describing the accepted mode
+    """
+    # Pixel format must be set before the resolution on most backends
+    if fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    cap.set(cv2.CAP_PROP_FPS, fps)
+
+    # Keep the driver queue short so reads return the newest frame
+    buffer_ok = cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+    return {
+        'fourcc': fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': cap.get(cv2.CAP_PROP_FPS),
+        'buffer_size': buffer_size if buffer_ok else None
+    }
+
+
+def measure_delivery_rate(cap, sample_frames=15, warmup_frames=3):
+    """Time consecutive reads to get the frame rate the device really delivers"""
+    for _ in range(warmup_frames):
+        cap.read()
+
+    start = time.monotonic()
+    delivered = 0
+    for _ in range(sample_frames):
+        ret, _ = cap.read()
+        if ret:
+            delivered += 1
+    elapsed = time.monotonic() - start
+
+    return delivered / elapsed if elapsed > 0 else 0.0
+
+
+def negotiate_mode(cap, width, height, fps, fourccs=None, buffer_size=1, sample_frames=15):
+    """
+    Find the best mode at or below the requested resolution
+    Tries each pixel format (in preference order) at each resolution and
+    accepts the first mode delivering at least 90% of the requested rate;
+    otherwise keeps the fastest mode seen.
+    Returns: dict with the negotiated mode and its measured_fps
+    """
+    fourccs = fourccs or DEFAULT_FOURCCS
+    resolutions = [(width, height)] + [
+        (w, h) for w, h in FALLBACK_RESOLUTIONS
+        if w * h < width * height
+    ]
+
+    best = None
+    tried = []
+
+    for w, h in resolutions:
+        for fourcc in fourccs:
+            mode = apply_mode(cap, fourcc, w, h, fps, buffer_size)
+
+            if mode['fourcc'] != fourcc or (mode['width'], mode['height']) != (w, h):
+                # Driver substituted something else - not a supported mode
+                tried.append(f"{fourcc} {w}x{h}: rejected")
+                continue
+
+            mode['measured_fps'] = round(measure_delivery_rate(cap, sample_frames), 1)
+            tried.append(f"{fourcc} {w}x{h}: {mode['measured_fps']} fps")
+
+            if best is None or mode['measured_fps'] > best['measured_fps']:
+                best = mode
+
+            if mode['measured_fps'] >= 0.9 * fps:
+                logger.debug(f"Camera modes tried: {', '.join(tried)}")
+                return mode
+
+    logger.debug(f"Camera modes tried: {', '.join(tried)}")
+
+    if best is None:
+        # Nothing matched exactly - fall back to the driver default
+        best = apply_mode(cap, None, width, height, fps, buffer_size)
+        best['measured_fps'] = round(measure_delivery_rate(cap, sample_frames), 1)
+    elif (best['fourcc'], best['width'], best['height']) != (
+            fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))):
+        apply_mode(cap, best['fourcc'], best['width'], best['height'], fps, buffer_size)
+
+    logger.warning(
+        f"Camera cannot deliver {fps} fps; best mode reaches {best['measured_fps']} fps"
+    )
+    return best
+
+
+def describe_mode(mode):
+    """One-line summary of a negotiated mode for logs"""
+    buffer = mode.get('buffer_size') or 'driver default'
+    return (
+        f"{mode['fourcc']} {mode['width']}x{mode['height']} @ {mode['fps']:.0f} fps reported, "
+        f"{mode.get('measured_fps') or 0:.1f} fps measured (buffer {buffer})"
+    )
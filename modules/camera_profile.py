@@ -0,0 +1,147 @@
+"""
+Camera Device Profile
+Remembers the last working camera (index, backend, FOURCC, resolution) and
+probes for devices in parallel when that profile is missing or stale
+"""
+
+import json
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import cv2
+
+from utils.logger import logger
+
+
+DEFAULT_PROFILE_PATH = 'camera_profile.json'
+
+
+def preferred_backends():
+    """Capture backends to try, fastest-opening first for this platform"""
+    system = platform.system()
+
+    if system == 'Windows':
+        # MSMF can take tens of seconds to open and apply properties
+        return ['CAP_DSHOW', 'CAP_MSMF']
+    if system == 'Linux':
+        return ['CAP_V4L2', 'CAP_ANY']
+    if system == 'Darwin':
+        return ['CAP_AVFOUNDATION', 'CAP_ANY']
+    return ['CAP_ANY']
+
+
+def fourcc_to_str(value):
+    """Convert CAP_PROP_FOURCC value to a 4-character code"""
+    value = int(value)
+    return ''.join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00')
+
+
+def load_profile(path=DEFAULT_PROFILE_PATH):
+    """Load cached camera profile, or None if absent/corrupt"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_profile(profile, path=DEFAULT_PROFILE_PATH):
+    """Persist camera profile for the next start"""
+    try:
+        with open(path, 'w') as f:
+            json.dump(profile, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not save camera profile: {e}")
+
+
+def _try_open(index, backends):
+    """
+    Open a camera index with each backend in turn
+    Returns: (cap, backend) for the first one that delivers a frame, else None
+    """
+    for backend in backends:
+        cap = cv2.VideoCapture(index, getattr(cv2, backend, cv2.CAP_ANY))
+        if cap.isOpened():
+            ret, _ = cap.read()
+            if ret:
+                return cap, backend
+        cap.release()
+    return None
+
+
+def _release_result(future):
+    """Done-callback that closes devices opened after we stopped waiting"""
+    result = future.result()
+    if result:
+        result[0].release()
+
+
+def probe_devices(indices, backends=None, timeout=5.0):
+    """
+    Probe camera indices in parallel and keep the first that responds
+    Args:
+        indices: Camera indices to try
+        backends: Backend names (cv2.CAP_* attribute names) tried per index
+        timeout: Seconds to wait overall before giving up
+    Returns: (cap, index, backend) or None
+    """
+    backends = backends or preferred_backends()
+    executor = ThreadPoolExecutor(max_workers=len(indices), thread_name_prefix="CameraProbe")
+    futures = {executor.submit(_try_open, i, backends): i for i in indices}
+
+    deadline = time.monotonic() + timeout
+    pending = set(futures)
+    found = None
+
+    while pending and found is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            result = future.result()
+            if result is None:
+                continue
+            if found is None:
+                found = (result[0], futures[future], result[1])
+            else:
+                result[0].release()
+
+    # Devices still opening are released whenever they finish
+    for future in pending:
+        future.add_done_callback(_release_result)
+    executor.shutdown(wait=False)
+
+    return found
+
+
+def open_profile(profile, timeout=3.0):
+    """
+    Open the device recorded in a profile, bounded by a timeout
+    Returns: cap or None
+    """
+    result = {'abandoned': False}
+    lock = threading.Lock()
+
+    def target():
+        opened = _try_open(profile['index'], [profile['backend']])
+        with lock:
+            if result['abandoned'] and opened:
+                opened[0].release()  # Caller already gave up on this device
+            result['value'] = opened
+
+    thread = threading.Thread(target=target, name="CameraOpen", daemon=True)
+    thread.start()
+    thread.join(timeout)
+
+    with lock:
+        if 'value' not in result:
+            result['abandoned'] = True
+            logger.warning(f"Cached camera {profile['index']} did not open within {timeout}s")
+            return None
+
+    opened = result['value']
+    return opened[0] if opened else None
@@ -0,0 +1,261 @@
+"""
+Hand Detector Backends
+Interchangeable hand landmark models behind one interface:
+    - solutions: legacy mp.solutions.hands graph
+    - tasks:     MediaPipe Tasks HandLandmarker in VIDEO or LIVE_STREAM mode
+    - replay:    pre-recorded landmarks (see benchmark.py --record)
+
+Every backend returns, per frame, a list of (label, (21, 3) float32 array of
+normalized x, y, z) relative to the image it was given.
+"""
+
+import json
+import os
+import threading
+
+import numpy as np
+
+from utils.logger import logger
+
+
+class DetectorBackend:
+    """Base class for hand landmark backends"""
+
+    name = 'base'
+    supports_roi = True  # Results describe the image passed to detect()
+    needs_warm_up = True  # First detect() pays for graph setup / model load
+
+    def detect(self, rgb_frame, timestamp):
+        """
+        Find hands in an RGB frame
+        Args:
+            rgb_frame: RGB uint8 image
+            timestamp: Capture time in seconds (monotonic)
+        Returns:
+            List of (label, (21, 3) float32 normalized landmarks)
+        """
+        raise NotImplementedError
+
+    def describe(self):
+        return self.name
+
+    def close(self):
+        """Release model resources"""
+        pass
+
+
+class SolutionsBackend(DetectorBackend):
+    """Legacy mp.solutions.hands graph"""
+
+    name = 'solutions'
+
+    def __init__(self, max_hands=2, min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5, model_complexity=1):
+        """
+        Args:
+            max_hands: Maximum number of hands
+            min_detection_confidence: Palm detector threshold
+            min_tracking_confidence: Landmark tracking threshold
+            model_complexity: 0 (lite, faster) or 1 (full, more accurate)
+        """
+        import mediapipe as mp
+
+        self.model_complexity = model_complexity
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_hands,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def detect(self, rgb_frame, timestamp):
+        results = self.hands.process(rgb_frame)
+        if not results.multi_hand_landmarks:
+            return []
+
+        return [
+            (
+                handedness.classification[0].label,
+                np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+            )
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks,
+                                                  results.multi_handedness)
+        ]
+
+    def describe(self):
+        return f"solutions (model_complexity={self.model_complexity})"
+
+    def close(self):
+        self.hands.close()
+
+
+class TasksBackend(DetectorBackend):
+    """MediaPipe Tasks HandLandmarker (needs a .task model bundle)"""
+
+    name = 'tasks'
+
+    def __init__(self, model_path, running_mode='video', max_hands=2,
+                 min_detection_confidence=0.5, min_presence_confidence=0.5,
+                 min_tracking_confidence=0.5):
+        """
+        Args:
+            model_path: Path to hand_landmarker.task
+            running_mode: 'video' (synchronous) or 'live_stream' (asynchronous;
+                results lag the submitted frame by the inference time)
+            max_hands: Maximum number of hands
+            min_detection_confidence, min_presence_confidence,
+            min_tracking_confidence: HandLandmarker thresholds
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Hand landmarker model not found: {model_path}")
+
+        import mediapipe as mp
+        from mediapipe.tasks.python import vision
+        from mediapipe.tasks.python.core.base_options import BaseOptions
+
+        self.mp = mp
+        self.running_mode = running_mode
+        self.live_stream = running_mode == 'live_stream'
+        self.supports_roi = not self.live_stream  # Async results may belong to an older crop
+        self.last_timestamp_ms = -1
+
+        self.lock = threading.Lock()
+        self.latest = []  # Most recent async result
+
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=(vision.RunningMode.LIVE_STREAM if self.live_stream
+                          else vision.RunningMode.VIDEO),
+            num_hands=max_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result if self.live_stream else None
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def detect(self, rgb_frame, timestamp):
+        # Tasks require strictly increasing millisecond timestamps
+        timestamp_ms = max(int(timestamp * 1000), self.last_timestamp_ms + 1)
+        self.last_timestamp_ms = timestamp_ms
+
+        image = self.mp.Image(image_format=self.mp.ImageFormat.SRGB,
+                              data=np.ascontiguousarray(rgb_frame))
+
+        if self.live_stream:
+            self.landmarker.detect_async(image, timestamp_ms)
+            with self.lock:
+                return self.latest
+
+        return self._convert(self.landmarker.detect_for_video(image, timestamp_ms))
+
+    def _on_result(self, result, image, timestamp_ms):
+        """LIVE_STREAM callback (runs on a MediaPipe thread)"""
+        detections = self._convert(result)
+        with self.lock:
+            self.latest = detections
+
+    def _convert(self, result):
+        return [
+            (
+                handedness[0].category_name,
+                np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float32)
+            )
+            for hand_landmarks, handedness in zip(result.hand_landmarks, result.handedness)
+        ]
+
+    def describe(self):
+        return f"tasks ({self.running_mode})"
+
+    def close(self):
+        self.landmarker.close()
+
+
+class ReplayBackend(DetectorBackend):
+    """Plays back landmarks recorded with benchmark.py --record"""
+
+    name = 'replay'
+    supports_roi = False  # Recorded landmarks are always full-frame
+    needs_warm_up = False  # Would consume recorded frames
+
+    def __init__(self, path, loop=False):
+        """
+        Args:
+            path: JSON recording ({"frames": [[{"label", "landmarks"}, ...], ...]})
+            loop: Restart from the first frame when the recording ends
+        """
+        with open(path, 'r') as f:
+            recording = json.load(f)
+
+        self.path = path
+        self.loop = loop
+        self.frames = [
+            [(hand['label'], np.array(hand['landmarks'], dtype=np.float32)) for hand in frame]
+            for frame in recording['frames']
+        ]
+        self.position = 0
+
+    def detect(self, rgb_frame, timestamp):
+        if self.position >= len(self.frames):
+            if not self.loop or not self.frames:
+                return []
+            self.position = 0
+
+        detections = self.frames[self.position]
+        self.position += 1
+        return detections
+
+    def describe(self):
+        return f"replay ({self.path}, {len(self.frames)} frames)"
+
+
+def save_recording(path, frames):
+    """
+    Write landmarks for ReplayBackend
+    Args:
+        frames: One list per frame of (label, (21, 3) normalized landmarks)
+    """
+    recording = {
+        'frames': [
+            [{'label': label, 'landmarks': np.asarray(landmarks).round(6).tolist()}
+             for label, landmarks in frame]
+            for frame in frames
+        ]
+    }
+    with open(path, 'w') as f:
+        json.dump(recording, f)
+
+
+def create_detector_backend(config):
+    """
+    Build the backend described by config['hand_detection']['backend']
+    Falls back to the legacy solutions backend if the requested one cannot load
+    """
+    detection_config = config['hand_detection']
+    backend_config = detection_config.get('backend', {})
+    backend_type = backend_config.get('type', 'solutions')
+
+    common = {
+        'max_hands': detection_config['max_hands'],
+        'min_detection_confidence': detection_config['min_detection_confidence'],
+        'min_tracking_confidence': detection_config['min_tracking_confidence']
+    }
+
+    try:
+        if backend_type == 'tasks':
+            return TasksBackend(
+                model_path=backend_config.get('model_path', 'models/hand_landmarker.task'),
+                running_mode=backend_config.get('running_mode', 'video'),
+                min_presence_confidence=backend_config.get('min_presence_confidence', 0.5),
+                **common
+            )
+        if backend_type == 'replay':
+            return ReplayBackend(backend_config['path'], loop=backend_config.get('loop', False))
+        if backend_type != 'solutions':
+            logger.warning(f"Unknown detector backend '{backend_type}', using solutions")
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        logger.error(f"Could not load '{backend_type}' detector backend: {e}")
+        logger.warning("Falling back to the solutions backend")
+
+    return SolutionsBackend(model_complexity=backend_config.get('model_complexity', 1), **common)
@@ -0,0 +1,255 @@
+"""
+Frame Capture Stage
+Reads frames from a frame source on a dedicated thread and hands only
+the newest one to the processing loop
+"""
+
+import threading
+import time
+from enum import Enum
+
+from utils.logger import logger
+
+
+class LatestFrameMailbox:
+    """Single-slot mailbox that always holds the most recent frame"""
+
+    def __init__(self, drop_stale=True):
+        """
+        Initialize empty mailbox
+        Args:
+            drop_stale: Overwrite unread frames (live sources). When False,
+                put() blocks until the consumer has taken the previous frame
+        """
+        self.drop_stale = drop_stale
+        self._condition = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self._sequence = 0
+        self._closed = False
+
+        # Statistics
+        self.frames_put = 0
+        self.frames_dropped = 0
+
+    def put(self, frame, timestamp):
+        """
+        Store a new frame, overwriting any frame not yet taken
+        Args:
+            frame: BGR image
+            timestamp: time.monotonic() at which the frame was read
+        """
+        with self._condition:
+            if not self.drop_stale:
+                self._condition.wait_for(
+                    lambda: self._frame is None or self._closed
+                )
+
+            if self._frame is not None:
+                # Consumer never saw the previous frame
+                self.frames_dropped += 1
+
+            self._frame = frame
+            self._timestamp = timestamp
+            self._sequence += 1
+            self.frames_put += 1
+            self._condition.notify()
+
+    def get(self, timeout=None):
+        """
+        Wait for a frame newer than the last one taken
+        Returns: (frame, timestamp, sequence) or None on timeout/close
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frame is not None or self._closed,
+                timeout
+            )
+
+            if self._frame is None:
+                return None
+
+            frame = self._frame
+            self._frame = None
+            self._condition.notify_all()
+            return frame, self._timestamp, self._sequence
+
+    def close(self):
+        """Wake up any waiting producer or consumer"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def is_closed(self):
+        """True once the producer has finished or the mailbox was closed"""
+        return self._closed
+
+
+class CaptureHealth(Enum):
+    """Health of the capture stage"""
+    HEALTHY = "healthy"
+    STALLED = "stalled"  # Reads failing, retrying with backoff
+    LOST = "lost"        # Device considered gone, reopening with backoff
+
+
+class CaptureWorker(threading.Thread):
+    """Background thread that keeps the mailbox filled with fresh frames"""
+
+    def __init__(self, source, mailbox, recovery_config=None, status_callback=None):
+        """
+        Args:
+            source: Opened FrameSource
+            mailbox: LatestFrameMailbox receiving the frames
+            recovery_config: Optional dict with initial_backoff, max_backoff
+                (seconds) and failures_before_lost
+            status_callback: Called with the CaptureHealth value string
+                whenever the reported health changes
+        """
+        super().__init__(name="CaptureWorker", daemon=True)
+        self.source = source
+        self.mailbox = mailbox
+        self.status_callback = status_callback
+
+        recovery_config = recovery_config or {}
+        self.initial_backoff = recovery_config.get('initial_backoff', 0.05)
+        self.max_backoff = recovery_config.get('max_backoff', 2.0)
+        self.failures_before_lost = recovery_config.get('failures_before_lost', 5)
+
+        self.health = CaptureHealth.HEALTHY
+        # Last health logged and sent to status_callback; self.health also
+        # moves silently (LOST -> STALLED after a reopen) and must not re-notify
+        self.reported_health = CaptureHealth.HEALTHY
+        self.consecutive_failures = 0
+
+        # Measured delivery rate, refreshed about once per second
+        self.delivery_fps = 0.0
+        self._rate_count = 0
+        self._rate_start = time.monotonic()
+
+        self.reconnect_attempts = 0
+        self._stop_event = threading.Event()
+
+        # Low-power (idle) capture; requests are applied on the capture thread
+        self.low_power = False
+        self.low_power_interval = 0.0
+        self._pending_low_power = None
+
+    @property
+    def is_running(self):
+        return not self._stop_event.is_set()
+
+    def run(self):
+        """Capture loop with stall detection and automatic reopen"""
+        while not self._stop_event.is_set():
+            if self._pending_low_power is not None:
+                self._apply_low_power(self._pending_low_power)
+
+            if self.health == CaptureHealth.LOST:
+                self._reopen_source()
+                continue
+
+            ret, frame = self.source.read()
+
+            if ret:
+                self.consecutive_failures = 0
+                if self.health != CaptureHealth.HEALTHY:
+                    self._set_health(CaptureHealth.HEALTHY)
+                    self.reconnect_attempts = 0
+                now = time.monotonic()
+                self._update_delivery_rate(now)
+                self.mailbox.put(frame, now)
+
+                if self.low_power:
+                    # Throttle reads; the driver discards what we skip
+                    self._stop_event.wait(self.low_power_interval)
+                continue
+
+            if self.source.is_exhausted:
+                logger.info(f"{self.source.describe()} finished")
+                break
+
+            self._handle_read_failure()
+
+        self.mailbox.close()
+
+    def set_low_power(self, enabled, fps=5):
+        """Request low-rate capture (idle) or a return to full rate"""
+        self.low_power_interval = 1.0 / fps if fps else 0.0
+        self._pending_low_power = enabled
+
+    def _apply_low_power(self, enabled):
+        """Switch capture rate and let the source change its mode"""
+        self._pending_low_power = None
+        if enabled == self.low_power:
+            return
+
+        self.low_power = enabled
+        self.source.set_low_power(enabled)
+
+    def _update_delivery_rate(self, now):
+        """Count delivered frames and refresh delivery_fps every second"""
+        self._rate_count += 1
+        elapsed = now - self._rate_start
+        if elapsed >= 1.0:
+            self.delivery_fps = self._rate_count / elapsed
+            self._rate_count = 0
+            self._rate_start = now
+
+    def _handle_read_failure(self):
+        """Back off after a failed read; declare the device lost if it persists"""
+        self.consecutive_failures += 1
+
+        if self.consecutive_failures >= self.failures_before_lost:
+            self._set_health(CaptureHealth.LOST)
+            return
+
+        if self.health == CaptureHealth.HEALTHY:
+            self._set_health(CaptureHealth.STALLED)
+
+        self._stop_event.wait(self._backoff(self.consecutive_failures - 1))
+
+    def _reopen_source(self):
+        """Wait out the backoff, then release and reopen the source"""
+        self._stop_event.wait(self._backoff(self.reconnect_attempts))
+        if self._stop_event.is_set():
+            return
+
+        self.reconnect_attempts += 1
+        logger.info(f"Reopening {self.source.describe()} (attempt {self.reconnect_attempts})...")
+
+        self.source.release()
+        if self.source.open():
+            # Stay unhealthy until the first good frame arrives
+            self.consecutive_failures = 0
+            self.health = CaptureHealth.STALLED
+
+    def _backoff(self, attempt):
+        """Exponential backoff delay in seconds"""
+        return min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+
+    def _set_health(self, health):
+        """Record a health transition; log and notify only if the reported state changes"""
+        self.health = health
+        if health == self.reported_health:
+            return
+        self.reported_health = health
+
+        if health == CaptureHealth.STALLED:
+            logger.warning("Failed to read frame from camera, retrying with backoff")
+        elif health == CaptureHealth.LOST:
+            if self.reconnect_attempts == 0:
+                logger.error(
+                    f"Camera lost after {self.consecutive_failures} failed reads, reconnecting..."
+                )
+        elif self.reconnect_attempts:
+            logger.info(f"Camera recovered after {self.reconnect_attempts} reconnect attempt(s)")
+
+        if self.status_callback:
+            self.status_callback(health.value)
+
+    def stop(self):
+        """Stop capturing and wait for the thread to exit"""
+        self._stop_event.set()
+        self.mailbox.close()
+        self.join(timeout=2.0)
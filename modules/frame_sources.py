@@ -0,0 +1,387 @@
+"""
+Frame Sources
+Common interface over live cameras, recorded video, image folders and
+synthetic patterns so the pipeline can run without a webcam
+"""
+
+import os
+import time
+
+import cv2
+import numpy as np
+
+from modules.camera_profile import (DEFAULT_PROFILE_PATH, load_profile, save_profile,
+                                    open_profile, probe_devices)
+from modules.camera_negotiation import apply_mode, negotiate_mode, describe_mode
+from utils.logger import logger
+
+
+class FrameSource:
+    """Base class for anything that produces BGR frames"""
+
+    # Live sources deliver frames on their own clock and may drop frames;
+    # offline sources must have every frame processed
+    is_live = True
+
+    def __init__(self):
+        self.is_exhausted = False
+
+    def open(self):
+        """Open the source. Returns True on success"""
+        raise NotImplementedError
+
+    def read(self):
+        """Read next frame. Returns (ret, frame) like cv2.VideoCapture.read"""
+        raise NotImplementedError
+
+    def is_opened(self):
+        """Return True while the source can deliver frames"""
+        raise NotImplementedError
+
+    def release(self):
+        """Release underlying resources"""
+        pass
+
+    def set_low_power(self, enabled):
+        """Switch to/from a cheaper capture mode while the app is idle"""
+        pass
+
+    def describe(self):
+        """Short human-readable description for logs"""
+        return self.__class__.__name__
+
+
+class WebcamSource(FrameSource):
+    """Live camera through cv2.VideoCapture"""
+
+    is_live = True
+
+    def __init__(self, width=1280, height=720, fps=30, indices=(0, 1, 2),
+                 profile_path=DEFAULT_PROFILE_PATH, probe_timeout=5.0,
+                 fourccs=None, buffer_size=1, negotiate=True, idle_resolution=None):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.indices = list(indices)
+        self.profile_path = profile_path
+        self.probe_timeout = probe_timeout
+        self.fourccs = fourccs
+        self.buffer_size = buffer_size
+        self.negotiate = negotiate
+        self.idle_resolution = idle_resolution
+        self.index = None
+        self.backend = None
+        self.cap = None
+        self.mode = None
+
+    def open(self):
+        """
+        Open the camera from the cached profile when possible, otherwise
+        probe all indices in parallel and negotiate a mode
+        """
+        start = time.monotonic()
+        profile = load_profile(self.profile_path)
+
+        if profile:
+            self.cap = open_profile(profile)
+            if self.cap is not None:
+                self.index = profile['index']
+                self.backend = profile['backend']
+
+                if profile.get('requested') == [self.width, self.height, self.fps]:
+                    # Reuse the previously negotiated mode without re-measuring
+                    self.mode = apply_mode(self.cap, profile['fourcc'], profile['width'],
+                                           profile['height'], self.fps, self.buffer_size)
+                    self.mode['measured_fps'] = profile.get('measured_fps')
+                else:
+                    self._negotiate_mode()
+
+                logger.info(
+                    f"Camera {self.index} opened from cached profile in "
+                    f"{(time.monotonic() - start) * 1000:.0f} ms"
+                )
+                self._finish_open()
+                return True
+            logger.info("Cached camera profile is stale, probing devices...")
+
+        found = probe_devices(self.indices, timeout=self.probe_timeout)
+        if found is None:
+            logger.error("No camera available!")
+            return False
+
+        self.cap, self.index, self.backend = found
+        self._negotiate_mode()
+        logger.info(
+            f"Camera {self.index} ({self.backend}) found by probing in "
+            f"{(time.monotonic() - start) * 1000:.0f} ms"
+        )
+        self._finish_open()
+        return True
+
+    def _negotiate_mode(self):
+        """Pick pixel format, resolution and buffering for this device"""
+        if self.negotiate:
+            self.mode = negotiate_mode(self.cap, self.width, self.height, self.fps,
+                                       fourccs=self.fourccs, buffer_size=self.buffer_size)
+        else:
+            self.mode = apply_mode(self.cap, None, self.width, self.height,
+                                   self.fps, self.buffer_size)
+
+    def _finish_open(self):
+        """Report the negotiated mode and remember it for the next start"""
+        logger.info(f"Camera mode: {describe_mode(self.mode)}")
+        save_profile({
+            'index': self.index,
+            'backend': self.backend,
+            'requested': [self.width, self.height, self.fps],
+            **self.mode
+        }, self.profile_path)
+
+    def set_low_power(self, enabled):
+        """Drop to the idle resolution, or restore the negotiated mode"""
+        if not self.idle_resolution or self.cap is None:
+            return
+
+        if enabled:
+            width, height = self.idle_resolution
+            idle_mode = apply_mode(self.cap, self.mode['fourcc'], width, height,
+                                   self.fps, self.buffer_size)
+            logger.info(f"Camera idle mode: {idle_mode['width']}x{idle_mode['height']}")
+        else:
+            apply_mode(self.cap, self.mode['fourcc'], self.mode['width'],
+                       self.mode['height'], self.fps, self.buffer_size)
+            logger.info(f"Camera mode restored: {describe_mode(self.mode)}")
+
+    def read(self):
+        return self.cap.read()
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        return f"Webcam (index {self.index}, {self.backend})"
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, paced at its original timestamps or unthrottled"""
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.cap = None
+        self._start_time = None
+        self.is_live = realtime
+
+    def open(self):
+        if not os.path.exists(self.path):
+            logger.error(f"Video file not found: {self.path}")
+            return False
+
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            logger.error(f"Could not open video file: {self.path}")
+            return False
+
+        self._start_time = time.monotonic()
+        return True
+
+    def read(self):
+        ret, frame = self.cap.read()
+
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._start_time = time.monotonic()
+            ret, frame = self.cap.read()
+
+        if not ret:
+            self.is_exhausted = True
+            return False, None
+
+        if self.realtime:
+            # Sleep until this frame's presentation time
+            frame_time = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            delay = self._start_time + frame_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        return True, frame
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        mode = "realtime" if self.realtime else "unthrottled"
+        return f"Video file {self.path} ({mode})"
+
+
+class ImageDirectorySource(FrameSource):
+    """Folder of still images read in sorted filename order"""
+
+    IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, path, fps=None, loop=False):
+        super().__init__()
+        self.path = path
+        self.fps = fps
+        self.loop = loop
+        self.files = []
+        self.position = 0
+        self._next_time = None
+        self.is_live = fps is not None
+
+    def open(self):
+        if not os.path.isdir(self.path):
+            logger.error(f"Image directory not found: {self.path}")
+            return False
+
+        self.files = sorted(
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.lower().endswith(self.IMAGE_EXTENSIONS)
+        )
+
+        if not self.files:
+            logger.error(f"No images found in {self.path}")
+            return False
+
+        self._next_time = time.monotonic()
+        return True
+
+    def read(self):
+        if self.position >= len(self.files):
+            if not self.loop:
+                self.is_exhausted = True
+                return False, None
+            self.position = 0
+
+        if self.fps:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.monotonic()) + 1.0 / self.fps
+
+        frame = cv2.imread(self.files[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+    def is_opened(self):
+        return bool(self.files)
+
+    def describe(self):
+        return f"Image directory {self.path} ({len(self.files)} images)"
+
+
+class SyntheticSource(FrameSource):
+    """Generated test pattern: a skin-toned blob sweeping across a gradient"""
+
+    def __init__(self, width=1280, height=720, fps=None, num_frames=None):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.num_frames = num_frames
+        self.frame_index = 0
+        self._background = None
+        self._next_time = None
+        self.is_live = fps is not None
+
+    def open(self):
+        gradient = np.linspace(40, 120, self.width, dtype=np.uint8)
+        self._background = np.dstack([np.tile(gradient, (self.height, 1))] * 3)
+        self._next_time = time.monotonic()
+        return True
+
+    def read(self):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            self.is_exhausted = True
+            return False, None
+
+        if self.fps:
+            delay = self._next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time, time.monotonic()) + 1.0 / self.fps
+
+        frame = self._background.copy()
+
+        # Blob travels left-right and bobs up-down
+        phase = self.frame_index / 60.0
+        cx = int((0.5 + 0.35 * np.sin(2 * np.pi * phase)) * self.width)
+        cy = int((0.5 + 0.2 * np.sin(4 * np.pi * phase)) * self.height)
+        axes = (self.width // 12, self.height // 6)
+        cv2.ellipse(frame, (cx, cy), axes, 0, 0, 360, (120, 160, 220), -1)
+
+        self.frame_index += 1
+        return True, frame
+
+    def is_opened(self):
+        return self._background is not None
+
+    def describe(self):
+        return f"Synthetic pattern {self.width}x{self.height}"
+
+
+def _idle_resolution(config):
+    """(width, height) to capture at while idle, or None to keep the mode"""
+    idle_config = config.get('idle', {})
+    if idle_config.get('width') and idle_config.get('height'):
+        return idle_config['width'], idle_config['height']
+    return None
+
+
+def create_frame_source(config):
+    """
+    Build a frame source from config['camera']['source']
+    Defaults to the webcam when no source is configured
+    """
+    camera_config = config['camera']
+    source_config = camera_config.get('source', {})
+    source_type = source_config.get('type', 'webcam')
+
+    if source_type == 'webcam':
+        return WebcamSource(
+            width=camera_config['width'],
+            height=camera_config['height'],
+            fps=camera_config['fps'],
+            indices=source_config.get('indices', [0, 1, 2]),
+            profile_path=source_config.get('profile_path', DEFAULT_PROFILE_PATH),
+            probe_timeout=source_config.get('probe_timeout', 5.0),
+            fourccs=camera_config.get('fourcc_preference'),
+            buffer_size=camera_config.get('buffer_size', 1),
+            negotiate=camera_config.get('negotiate', True),
+            idle_resolution=_idle_resolution(config)
+        )
+    if source_type == 'video':
+        return VideoFileSource(
+            source_config['path'],
+            realtime=source_config.get('realtime', True),
+            loop=source_config.get('loop', False)
+        )
+    if source_type == 'images':
+        return ImageDirectorySource(
+            source_config['path'],
+            fps=source_config.get('fps'),
+            loop=source_config.get('loop', False)
+        )
+    if source_type == 'synthetic':
+        return SyntheticSource(
+            width=camera_config['width'],
+            height=camera_config['height'],
+            fps=source_config.get('fps'),
+            num_frames=source_config.get('num_frames')
+        )
+
+    raise ValueError(f"Unknown frame source type: {source_type}")
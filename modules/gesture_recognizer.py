@@ -8,24 +8,57 @@ import numpy as np
 import time
 import json
 import os
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 import pickle
-from collections import deque
+
+from modules.gesture_state import GestureHoldState
+from modules.gesture_table import StaticGestureTable
+from modules.hand_features import WRIST, MIDDLE_MCP
+from modules.swipe_detector import SwipeDetector
+from modules.trajectory_matcher import TrajectoryMatcher
+
+
+# During a pinch only thumb and index may move: middle, ring and pinky must
+# keep their finger_mask bits and stay within this many palm lengths of their
+# finger margins at the start of the pinch window
+PINCH_POSE_BITS = 0b11100
+PINCH_STILL_TOLERANCE = 0.1
+
+
 class GestureRecognizer:
     def __init__(self, config):
         """Initialize Gesture Recognizer"""
         self.config = config
+        recognition_config = config.get('gesture_recognition', {})
         
         # Load gesture definitions
         self.gesture_definitions = self._load_gesture_definitions()
-        
-        # Gesture history for dynamic gestures
-        self.gesture_history = deque(maxlen=15)
-        
-        # Simple cooldown
+        self.static_table = StaticGestureTable(self.gesture_definitions.get('static_gestures', {}))
+        
+        # Palm trajectory for swipes
+        self.swipe_detector = SwipeDetector(
+            window=recognition_config.get('swipe_window', 0.2),
+            distance=recognition_config.get('movement_threshold', 0.10),
+            dominance=recognition_config.get('swipe_dominance', 2.0)
+        )
+        
+        # Template trajectories (pinch, user-recorded circles, zig-zags, ...)
+        self.template_file = recognition_config.get('template_file', 'models/gesture_templates.json')
+        self.trajectory_matcher = TrajectoryMatcher(band=recognition_config.get('template_band', 4))
+        self.trajectory_matcher.add_builtin_templates(self.gesture_definitions.get('dynamic_gestures', {}))
+        self.trajectory_matcher.load_templates(self.template_file)
+        
+        # Pinch samples only count while middle, ring and pinky hold still;
+        # otherwise opening or closing the hand looks like a pinch
+        self.pinch_pose = None
+        self.pinch_anchor = None  # Their finger margins when the pinch buffer was last cleared
+        
+        # Track ID of the hand whose motion feeds the swipe and template buffers
+        self.primary_track_id = None
+        
+        # Minimum time between two triggers of the same gesture
         self.last_gesture_time = {}
-        self.cooldown = 1.0  # Simple 1 second cooldown for ALL gestures
+        self.cooldown = recognition_config.get('cooldown_time', 0.4)
+        self.confidence_threshold = recognition_config.get('confidence_threshold', 0.70)
         
         # ML Model
         self.use_ml = False  # DISABLE ML - use simple rules only
@@ -36,8 +69,17 @@ class GestureRecognizer:
         self.current_gesture = None
         self.gesture_confidence = 0.0
         
-        # Simple counters
-        self.gesture_hold_count = {}  # How many frames gesture is held
+        # Static gesture hold state per tracked hand
+        self.hold_params = {
+            'hold_time': recognition_config.get('hold_time', 0.15),
+            'release_time': recognition_config.get('release_time', 0.1),
+            'lost_time': recognition_config.get('lost_time', 0.5),
+            'repeat_time': recognition_config.get('repeat_time', 1.0),
+            'early_hold_time': recognition_config.get('early_hold_time', 0.05),
+            'max_hold_time': recognition_config.get('max_hold_time', 0.3),
+            'early_commit_margin': recognition_config.get('early_commit_margin', 0.8)
+        }
+        self.hold_states = {}  # track_id -> GestureHoldState
         
     def _load_gesture_definitions(self):
         """Load gesture definitions from JSON"""
@@ -70,6 +112,22 @@ class GestureRecognizer:
                         "fingers": [0, 1, 0, 0, 0],
                         "description": "Only index finger extended"
                     },
+                    "rock_sign": {
+                        "fingers": [0, 1, 0, 0, 1],
+                        "description": "Index and pinky extended"
+                    },
+                    "hang_loose": {
+                        "fingers": [1, 0, 0, 0, 1],
+                        "description": "Thumb and pinky extended"
+                    },
+                    "three_thumb": {
+                        "fingers": [1, 1, 1, 0, 0],
+                        "description": "Thumb, index and middle extended"
+                    },
+                    "four_fingers": {
+                        "fingers": [0, 1, 1, 1, 1],
+                        "description": "All fingers except thumb extended"
+                    },
                     "ok_sign": {
                         "description": "Thumb and index touching",
                         "special": "thumb_index_close"
@@ -122,6 +180,10 @@ class GestureRecognizer:
     
     def _initialize_ml_model(self):
         """Initialize or load ML model for gesture classification"""
+        # scikit-learn is slow to import; only pay for it when ML is used
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.preprocessing import StandardScaler
+        
         model_file = 'models/gesture_classifier.pkl'
         
         try:
@@ -204,176 +266,128 @@ class GestureRecognizer:
         
         return features
     
-    def recognize_gesture(self, hands_data):
+    def recognize_gesture(self, hands_data, timestamp=None):
         """
         SIMPLE gesture recognition - RELIABLE
+        Args:
+            hands_data: Hands from HandDetector
+            timestamp: Frame capture time (time.monotonic()); defaults to now
         """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        
+        # Forget hands that have been gone longer than the lost time
+        present = {hand.get('track_id') for hand in hands_data}
+        for track_id in [t for t, state in self.hold_states.items()
+                         if t not in present and timestamp - state.last_update > state.lost_time]:
+            del self.hold_states[track_id]
+        
         if not hands_data:
             # Clear history when no hands
-            self.gesture_history.clear()
-            self.gesture_hold_count.clear()
+            self.swipe_detector.reset()
+            self.trajectory_matcher.reset()
+            self.pinch_pose = None
+            self.primary_track_id = None
             return None, 0.0
         
-        hand_data = hands_data[0]
+        # Follow one hand while its track lasts; a change in hand order must
+        # not splice two hands' positions into one trajectory
+        hand_data = next((hand for hand in hands_data
+                          if hand.get('track_id') == self.primary_track_id), None)
+        if hand_data is None:
+            hand_data = hands_data[0]
+            self.primary_track_id = hand_data.get('track_id')
+            self.swipe_detector.reset()
+            self.trajectory_matcher.reset()
+            self.pinch_pose = None
+        
+        # Add to trajectory
+        palm_x, palm_y = hand_data.get('predicted_palm_center', hand_data['features']['palm_center'])
+        self.swipe_detector.add(timestamp, palm_x, palm_y)
+        features = hand_data['features']
+        palm_length = max(features['distance_matrix'][WRIST, MIDDLE_MCP], 1e-6)
+        self.trajectory_matcher.add_sample('palm', timestamp, (palm_x, palm_y))
+        pinch_pose = features['finger_mask'] & PINCH_POSE_BITS
+        other_margins = features['finger_margins'][2:]
+        if pinch_pose != self.pinch_pose or \
+                np.abs(other_margins - self.pinch_anchor).max() > PINCH_STILL_TOLERANCE:
+            self.trajectory_matcher.reset('pinch')
+            self.pinch_pose = pinch_pose
+            self.pinch_anchor = other_margins.copy()
+        self.trajectory_matcher.add_sample('pinch', timestamp, features['distances']['thumb_index'] / palm_length)
+        
+        # While a template is being recorded the movement must not trigger actions
+        if self.trajectory_matcher.recording is not None:
+            self.swipe_detector.reset()
+            return None, 0.0
         
-        # Add to history
-        self.gesture_history.append({
-            'features': hand_data['features'],
-            'landmarks': hand_data['landmarks'],
-            'timestamp': time.time()
-        })
+        # Keep the other hands' hold state current so a change in hand order
+        # does not restart their holds (their ready triggers are not consumed)
+        for other_hand in hands_data:
+            if other_hand is not hand_data:
+                self._recognize_static_simple(other_hand, timestamp)
         
         # STEP 1: Check for STATIC gestures (easier to detect)
-        static_gesture, static_conf = self._recognize_static_simple(hand_data)
+        static_gesture, static_conf = self._recognize_static_simple(hand_data, timestamp)
+        if static_gesture and not self._can_emit(static_gesture, static_conf, timestamp):
+            # Stays ready in the hold state and fires once the cooldown allows
+            static_gesture, static_conf = None, 0.0
         
-        # STEP 2: Check for SWIPE gestures (only if no static)
+        # STEP 2: Check for SWIPE and TEMPLATE gestures (only if no static)
         swipe_gesture = None
         swipe_conf = 0.0
+        template_gesture = None
+        template_conf = 0.0
         
         if not static_gesture:
-            swipe_gesture, swipe_conf = self._recognize_swipe_simple()
+            swipe_gesture, swipe_conf = self.swipe_detector.detect()
+            template_gesture, template_conf = self.trajectory_matcher.match()
         
         # Pick the best one
-        if static_conf > swipe_conf:
-            gesture = static_gesture
-            confidence = static_conf
-        else:
-            gesture = swipe_gesture
-            confidence = swipe_conf
+        gesture, confidence = max(
+            (static_gesture, static_conf), (swipe_gesture, swipe_conf), (template_gesture, template_conf),
+            key=lambda candidate: candidate[1]
+        )
         
-        # Check cooldown
-        if gesture and self._check_cooldown_simple(gesture):
+        # Check confidence and cooldown
+        if gesture and self._can_emit(gesture, confidence, timestamp):
             self.current_gesture = gesture
             self.gesture_confidence = confidence
-            self.last_gesture_time[gesture] = time.time()
+            self.last_gesture_time[gesture] = timestamp
+            if gesture == static_gesture:
+                self.hold_states[hand_data.get('track_id')].commit(timestamp)
             
-            # Clear history after gesture detected
-            self.gesture_history.clear()
+            # Clear history after gesture detected; a swipe may be the start
+            # of a longer template trajectory, so that one is kept
+            self.swipe_detector.reset()
+            if gesture != swipe_gesture:
+                self.trajectory_matcher.reset()
             
             return gesture, confidence
         
         return None, 0.0
     
-    def _recognize_static_simple(self, hand_data):
-        """SIMPLE static gesture recognition with ALTERNATIVES"""
+    def _recognize_static_simple(self, hand_data, timestamp):
+        """Static gesture recognition via the compiled finger-mask table"""
         features = hand_data['features']
-        fingers = features['extended_fingers']
-        count = sum(fingers)
-        
-        # Count how many frames this pattern is held
-        pattern_key = str(fingers)
-        if pattern_key not in self.gesture_hold_count:
-            self.gesture_hold_count[pattern_key] = 0
-        
-        self.gesture_hold_count[pattern_key] += 1
+        key, gesture, confidence, margin = self.static_table.lookup(features['finger_mask'], features)
         
-        # Clear other patterns
-        for key in list(self.gesture_hold_count.keys()):
-            if key != pattern_key:
-                self.gesture_hold_count[key] = 0
+        # Pattern must be held (per hand); clear patterns commit sooner
+        track_id = hand_data.get('track_id')
+        state = self.hold_states.get(track_id)
+        if state is None:
+            state = self.hold_states[track_id] = GestureHoldState(**self.hold_params)
         
-        # Need to hold for 5 frames (about 0.15 seconds)
-        if self.gesture_hold_count[pattern_key] < 5:
-            return None, 0.0
-        
-        # ===== BASIC GESTURES (Keep as is) =====
-        
-        # All 5 fingers open = OPEN PALM
-        if fingers == [1, 1, 1, 1, 1]:
-            return 'open_palm', 0.95
-        
-        # All fingers closed = FIST
-        if fingers == [0, 0, 0, 0, 0]:
-            return 'fist', 0.95
-        
-        # Only index finger = POINTING
-        if fingers == [0, 1, 0, 0, 0]:
-            return 'pointing', 0.95
-        
-        # Index + Middle = PEACE
-        if fingers == [0, 1, 1, 0, 0]:
-            return 'peace', 0.95
-        
-        # Only thumb = THUMBS UP
-        if fingers == [1, 0, 0, 0, 0]:
-            return 'thumbs_up', 0.95
-        
-        # ===== NEW ALTERNATIVE GESTURES =====
-        
-        # 🤘 ROCK (Index + Pinky) = VOLUME UP / SCROLL UP
-        if fingers == [0, 1, 0, 0, 1]:
-            return 'rock_sign', 0.95
-        
-        # 🤙 HANG LOOSE (Thumb + Pinky) = VOLUME DOWN / SCROLL DOWN
-        if fingers == [1, 0, 0, 0, 1]:
-            return 'hang_loose', 0.95
-        
-        # 👌 OK SIGN simulation (Thumb + Index + Middle) = NEXT
-        if fingers == [1, 1, 1, 0, 0]:
-            return 'three_thumb', 0.95
-        
-        # 🖖 VULCAN (Middle + Ring split) = PREVIOUS
-        if fingers == [0, 1, 1, 1, 1]:
-            return 'four_fingers', 0.95
-        
-        # Three fingers (Index + Middle + Ring) = GENERAL ACTION
-        if fingers == [0, 1, 1, 1, 0]:
-            return 'three_fingers', 0.95
-        
-        return None, 0.0
+        return state.update(key, gesture, confidence, timestamp, margin)
     
-    def _recognize_swipe_simple(self):
-        """EASIER swipe recognition - MORE FLEXIBLE"""
-        if len(self.gesture_history) < 6:  # Reduced from 8 - faster detection
-            return None, 0.0
-        
-        # Get positions
-        positions = [entry['features']['palm_center'] for entry in list(self.gesture_history)[-6:]]
-        
-        # Movement from start to end
-        start = positions[0]
-        end = positions[-1]
-        
-        dx = end[0] - start[0]
-        dy = end[1] - start[1]
-        
-        # EASIER threshold - only need 10% movement
-        move_size = np.sqrt(dx**2 + dy**2)
-        
-        if move_size < 0.10:  # Reduced from 0.15
-            return None, 0.0
-        
-        # MORE FLEXIBLE direction detection
-        abs_dx = abs(dx)
-        abs_dy = abs(dy)
-        
-        # HORIZONTAL swipe - dx must be 2x bigger (was 3x)
-        if abs_dx > abs_dy * 2:
-            if dx > 0:
-                return 'swipe_right', 0.90
-            else:
-                return 'swipe_left', 0.90
-        
-        # VERTICAL swipe - dy must be 2x bigger (was 3x)
-        if abs_dy > abs_dx * 2:
-            if dy > 0:
-                return 'swipe_down', 0.90
-            else:
-                return 'swipe_up', 0.90
-        
-        # Not clear enough
-        return None, 0.0
+    def _can_emit(self, gesture, confidence, timestamp):
+        """Confidence threshold and cooldown check for a candidate gesture"""
+        return confidence >= self.confidence_threshold and self._check_cooldown_simple(gesture, timestamp)
     
-    def _check_cooldown_simple(self, gesture):
-        """Smart cooldown - shorter for swipes"""
+    def _check_cooldown_simple(self, gesture, timestamp):
+        """Cooldown between triggers of the same gesture (held static gestures
+        repeat at the hold state's repeat_time instead)"""
         if gesture in self.last_gesture_time:
-            elapsed = time.time() - self.last_gesture_time[gesture]
-            
-            # Swipes can be faster
-            if gesture.startswith('swipe'):
-                return elapsed > 0.6  # Only 0.6 seconds for swipes
-            else:
-                return elapsed > 1.0  # 1 second for static gestures
+            return timestamp - self.last_gesture_time[gesture] > self.cooldown
         return True
         """Recognize static hand gestures - BALANCED"""
         features = hand_data['features']
@@ -421,6 +435,9 @@ class GestureRecognizer:
     
     def _ml_classify(self, hand_data):
         """Classify gesture using ML model"""
+        if self.ml_model is None:
+            self._initialize_ml_model()
+        
         try:
             # Extract features
             features = self._extract_ml_features(hand_data)
@@ -463,59 +480,6 @@ class GestureRecognizer:
         
         return features[:15]
     
-    def _recognize_dynamic_gesture(self):
-        """Recognize dynamic gestures - BALANCED and CLEAR"""
-        if len(self.gesture_history) < 10:
-            return None, 0.0
-        
-        # Get recent positions
-        recent_positions = []
-        for entry in list(self.gesture_history)[-10:]:
-            palm = entry['features']['palm_center']
-            recent_positions.append(palm)
-        
-        # Calculate movement vector
-        start_pos = recent_positions[0]
-        end_pos = recent_positions[-1]
-        
-        dx = end_pos[0] - start_pos[0]
-        dy = end_pos[1] - start_pos[1]
-        
-        movement_magnitude = np.sqrt(dx**2 + dy**2)
-        
-        # MODERATE threshold - not too easy, not too hard
-        threshold = 0.12
-        
-        if movement_magnitude < threshold:
-            return None, 0.0
-        
-        confidence = min(movement_magnitude / threshold, 1.0) * 0.90
-        
-        # CLEAR direction detection - need STRONG dominance
-        abs_dx = abs(dx)
-        abs_dy = abs(dy)
-        
-        # If movements are similar, IGNORE (too ambiguous)
-        if abs(abs_dx - abs_dy) < 0.05:
-            return None, 0.0
-        
-        # HORIZONTAL must be 2x stronger than vertical
-        if abs_dx > abs_dy * 2.0:
-            if dx > 0:
-                return 'swipe_right', confidence
-            else:
-                return 'swipe_left', confidence
-        
-        # VERTICAL must be 2x stronger than horizontal
-        elif abs_dy > abs_dx * 2.0:
-            if dy > 0:
-                return 'swipe_down', confidence
-            else:
-                return 'swipe_up', confidence
-        
-        # Not clear enough - ignore
-        return None, 0.0
-    
     def _check_cooldown(self, gesture):
         """Check if gesture is in cooldown period - BALANCED"""
         if gesture in self.last_gesture_time:
@@ -532,11 +496,31 @@ class GestureRecognizer:
             return elapsed > required_cooldown
         return True
     
+    def start_template_recording(self, name, channel='palm'):
+        """
+        Record the primary hand's next movement as a new dynamic gesture
+        No gestures are reported until finish_template_recording()
+        Args:
+            name: Gesture name to report when the movement is repeated
+            channel: 'palm' (hand path) or 'pinch' (thumb-index distance)
+        """
+        self.trajectory_matcher.start_recording(name, channel)
+    
+    def finish_template_recording(self, threshold=0.01):
+        """Stop recording, keep the template and save all user templates"""
+        template = self.trajectory_matcher.stop_recording(threshold)
+        if template is not None:
+            self.trajectory_matcher.save_templates(self.template_file)
+        return template
+    
     def get_current_gesture(self):
         """Get current recognized gesture"""
         return self.current_gesture, self.gesture_confidence
     
     def reset_gesture_history(self):
         """Reset gesture history"""
-        self.gesture_history.clear()
-        self.trajectory_buffer.clear()
\ No newline at end of file
+        self.swipe_detector.reset()
+        self.trajectory_matcher.reset()
+        self.pinch_pose = None
+        self.primary_track_id = None
+        self.hold_states.clear()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Gesture Hold State
+Per-hand debounce for static gestures driven by frame timestamps instead of
+frame counts, so the time to trigger is the same at 10 FPS and at 60 FPS:
+
+    IDLE --pattern seen--> CANDIDATE --held hold_time--> ACTIVE
+
+A different pattern only replaces the current one after it has persisted for
+release_time and for more than one frame (hysteresis), so single-frame
+flickers of the finger flags neither reset a hold in progress nor end an
+active gesture, even at low frame rates. Only a gap of lost_time without any
+frame (hand lost, recognition paused) drops the hold outright.
+
+The hold time depends on how unambiguous the pattern has been (its mean
+geometric margin over the hold, tolerated flickers counting as zero): clear
+gestures commit after early_hold_time, borderline ones wait up to
+max_hold_time. The same mean scales the reported confidence.
+"""
+
+# Reported confidence = table confidence * (MIN_CONFIDENCE_SCALE + rest * margin)
+MIN_CONFIDENCE_SCALE = 0.75
+
+
+class GestureHoldState:
+    """Hold / release state machine for one tracked hand"""
+
+    def __init__(self, hold_time=0.15, release_time=0.1, repeat_time=1.0,
+                 early_hold_time=0.05, max_hold_time=0.3, early_commit_margin=0.8,
+                 lost_time=0.5):
+        """
+        Args:
+            hold_time: Seconds a pattern must be held before it triggers
+                (margin just below early_commit_margin)
+            release_time: Seconds a different pattern must persist before
+                the current one is dropped
+            repeat_time: Seconds between repeated triggers while a gesture
+                stays held (0 triggers once per hold)
+            early_hold_time: Hold time once the mean margin reaches
+                early_commit_margin
+            max_hold_time: Hold time for a mean margin of 0
+            early_commit_margin: Mean margin (0-1) for an early commit
+            lost_time: Seconds without any frame for this hand after which
+                the hold is dropped (independent of frame spacing)
+        """
+        self.hold_time = hold_time
+        self.release_time = release_time
+        self.repeat_time = repeat_time
+        self.early_hold_time = early_hold_time
+        self.max_hold_time = max(max_hold_time, hold_time)
+        self.early_commit_margin = early_commit_margin
+        self.lost_time = lost_time
+        self.reset()
+
+    def reset(self):
+        self.key = None  # Pattern being held (finger mask or special rule)
+        self.gesture = None
+        self.confidence = 0.0
+        self.since = 0.0  # When the current pattern first appeared
+        self.last_match = 0.0  # Last frame showing the current pattern
+        self.last_update = None
+        self.active = False
+        self.next_trigger = 0.0
+        self.margin_sum = 0.0
+        self.frames = 0
+
+        # Competing pattern that has not yet outlasted release_time
+        self.pending_key = None
+        self.pending_since = 0.0
+
+    def update(self, key, gesture, confidence, timestamp, margin=None):
+        """
+        Feed one frame
+        Args:
+            key: Pattern key from StaticGestureTable.lookup
+            gesture: Gesture name for the key (None if it has none)
+            confidence: Confidence for the gesture
+            timestamp: Frame capture time (monotonic seconds)
+            margin: How unambiguous the pattern is this frame (0-1); None
+                uses the fixed hold_time and unscaled confidence
+        Returns:
+            (gesture, confidence) while the gesture is ready to trigger,
+            otherwise (None, 0.0); it stays ready until commit() is called
+        """
+        # A long gap (hand lost, recognition paused) ends the hold
+        if self.last_update is not None and timestamp - self.last_update > self.lost_time:
+            self.reset()
+        self.last_update = timestamp
+
+        if key == self.key:
+            self.last_match = timestamp
+            self.confidence = confidence
+            self.pending_key = None
+            self._add_margin(margin)
+        else:
+            if key != self.pending_key:
+                self.pending_key = key
+                self.pending_since = timestamp
+
+            first_frame = self.pending_since == timestamp
+            if self.key is not None and (first_frame or timestamp - self.last_match <= self.release_time):
+                # Tolerated dropout: keep holding the current pattern, but it counts against its margin
+                self._add_margin(None if margin is None else 0.0)
+                return self._trigger(timestamp)
+
+            # The challenger has persisted; its hold started when it first appeared
+            since = self.pending_since
+            self.reset()
+            self.last_update = timestamp
+            self.key = key
+            self.gesture = gesture
+            self.confidence = confidence
+            self.since = since
+            self.last_match = timestamp
+            self._add_margin(margin)
+
+        return self._trigger(timestamp)
+
+    def _add_margin(self, margin):
+        if margin is not None:
+            self.margin_sum += margin
+            self.frames += 1
+
+    @property
+    def margin(self):
+        """Mean margin over the current hold (None if margins are not used)"""
+        return self.margin_sum / self.frames if self.frames else None
+
+    def required_hold_time(self):
+        """Hold time for the current mean margin"""
+        margin = self.margin
+        if margin is None:
+            return self.hold_time
+        if margin >= self.early_commit_margin:
+            return self.early_hold_time
+
+        # Linear from max_hold_time (margin 0) to hold_time (just below early commit)
+        fraction = margin / self.early_commit_margin
+        return self.max_hold_time - (self.max_hold_time - self.hold_time) * fraction
+
+    def _trigger(self, timestamp):
+        if self.gesture is None:
+            return None, 0.0
+
+        if not self.active:
+            if timestamp - self.since < self.required_hold_time():
+                return None, 0.0
+            self.active = True
+            self.next_trigger = timestamp
+
+        if timestamp < self.next_trigger:
+            return None, 0.0
+
+        margin = self.margin
+        if margin is None:
+            return self.gesture, self.confidence
+        return self.gesture, self.confidence * (MIN_CONFIDENCE_SCALE + (1 - MIN_CONFIDENCE_SCALE) * margin)
+
+    def commit(self, timestamp):
+        """Consume the ready trigger (call only when the gesture was actually emitted)"""
+        self.next_trigger = timestamp + self.repeat_time if self.repeat_time else float('inf')
+
+    def held_for(self, timestamp):
+        """Seconds the current pattern has been held"""
+        return 0.0 if self.key is None else timestamp - self.since
@@ -0,0 +1,132 @@
+"""
+Static Gesture Table
+Compiles the static gestures declared in models/gesture_data.json into a
+32-entry lookup table indexed by the extended-finger bitmask (bit i = finger
+i, thumb..pinky), plus a short list of predicates for gestures declared with
+a 'special' rule instead of a finger pattern. Recognition is then one list
+index per frame, and new gestures only need a JSON entry.
+"""
+
+import numpy as np
+
+from utils.logger import logger
+
+
+NUM_PATTERNS = 32  # 2^5 finger states
+DEFAULT_CONFIDENCE = 0.95
+FULL_MARGIN = 0.2  # Finger margin (palm lengths) that counts as unambiguous
+
+
+def finger_mask(fingers):
+    """
+    Bitmask of a finger state list
+    Args:
+        fingers: Five 0/1 flags, thumb..pinky
+    Returns:
+        int in [0, 32)
+    """
+    mask = 0
+    for i, extended in enumerate(fingers):
+        if extended:
+            mask |= 1 << i
+    return mask
+
+
+def pattern_margin(finger_margins):
+    """
+    How unambiguous a finger pattern is: the weakest finger's distance from
+    the extended/curled boundary, scaled to [0, 1]
+    Args:
+        finger_margins: features['finger_margins']
+    """
+    return min(float(np.abs(finger_margins).min()) / FULL_MARGIN, 1.0)
+
+
+# Special rules: (features, threshold) -> margin in [0, 1], > 0 = match
+def _thumb_index_close(features, threshold):
+    return max(0.0, 1.0 - features['distances']['thumb_index'] / threshold)
+
+
+def _thumb_middle_close(features, threshold):
+    return max(0.0, 1.0 - features['distances']['thumb_middle'] / threshold)
+
+
+# Rule name -> (test, default threshold)
+SPECIAL_RULES = {
+    'thumb_index_close': (_thumb_index_close, 0.05),
+    'thumb_middle_close': (_thumb_middle_close, 0.06),
+}
+
+
+class StaticGestureTable:
+    """Finger bitmask -> gesture lookup compiled from gesture definitions"""
+
+    def __init__(self, static_gestures):
+        """
+        Args:
+            static_gestures: The 'static_gestures' section of gesture_data.json;
+                entries have either "fingers" or "special" (optional
+                "threshold" and "confidence")
+        """
+        self.table = [None] * NUM_PATTERNS  # mask -> (name, confidence)
+        self.specials = []  # (name, confidence, test, threshold), in file order
+
+        for name, definition in static_gestures.items():
+            confidence = definition.get('confidence', DEFAULT_CONFIDENCE)
+
+            if 'fingers' in definition:
+                fingers = definition['fingers']
+                if len(fingers) != 5:
+                    logger.warning(f"Gesture '{name}': expected 5 finger flags, got {len(fingers)}")
+                    continue
+
+                mask = finger_mask(fingers)
+                if self.table[mask] is not None:
+                    logger.warning(
+                        f"Gesture '{name}' has the same fingers as '{self.table[mask][0]}', ignoring"
+                    )
+                    continue
+                self.table[mask] = (name, confidence)
+
+            elif 'special' in definition:
+                rule = SPECIAL_RULES.get(definition['special'])
+                if rule is None:
+                    logger.warning(f"Gesture '{name}': unknown rule '{definition['special']}'")
+                    continue
+
+                test, threshold = rule
+                self.specials.append(
+                    (name, confidence, test, definition.get('threshold', threshold))
+                )
+
+            else:
+                logger.warning(f"Gesture '{name}' has neither 'fingers' nor 'special', ignoring")
+
+    def lookup(self, mask, features):
+        """
+        Match one frame
+        Finger patterns take precedence; special rules are only tried when
+        the pattern has no gesture of its own
+        Args:
+            mask: features['finger_mask']
+            features: Features dict (finger margins, special rules)
+        Returns:
+            (key, name, confidence, margin): key identifies the matched pattern
+            or rule for hold counting; name is None when nothing matched;
+            margin (0-1) is how unambiguous the match is
+        """
+        entry = self.table[mask]
+        if entry is not None:
+            return mask, entry[0], entry[1], pattern_margin(features['finger_margins'])
+
+        for index, (name, confidence, test, threshold) in enumerate(self.specials):
+            margin = test(features, threshold)
+            if margin > 0:
+                return NUM_PATTERNS + index, name, confidence, margin
+
+        return mask, None, 0.0, 0.0
+
+    def names(self):
+        """All gesture names in the table"""
+        return [entry[0] for entry in self.table if entry is not None] + \
+               [special[0] for special in self.specials]
@@ -1,31 +1,63 @@
 import cv2
-import mediapipe as mp
 import numpy as np
-from collections import deque
 import time
 
+from modules.detector_backends import create_detector_backend
+from modules.hand_features import calculate_features
+from modules.hand_tracker import HandTracker
+from modules.landmark_filter import OneEuroFilter
+from modules.landmarks import HandLandmarks
+from utils.logger import logger
+from utils.profiler import profiler
+
 
 class HandDetector:
     def __init__(self, config):
-        """Initialize Hand Detector with Mediapipe"""
+        """Initialize Hand Detector with the configured landmark backend"""
         self.config = config
         
-        # Initialize Mediapipe Hands
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_drawing_styles = mp.solutions.drawing_styles
-        
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=config['hand_detection']['max_hands'],
-            min_detection_confidence=config['hand_detection']['min_detection_confidence'],
-            min_tracking_confidence=config['hand_detection']['min_tracking_confidence']
+        # Landmark model (legacy solutions graph, Tasks landmarker or replay)
+        self.backend = create_detector_backend(config)
+        logger.info(f"Hand detector backend: {self.backend.describe()}")
+        
+        # Inference resolution (None = run detection on the full frame)
+        # Landmarks are normalized, so they map back to full-frame pixels
+        self.inference_width = config['hand_detection'].get('inference_width')
+        
+        # ROI tracking: search only near the hands found in the last frame
+        self.roi_tracking = (config['hand_detection'].get('roi_tracking', False) and
+                             self.backend.supports_roi)
+        self.roi_expansion = config['hand_detection'].get('roi_expansion', 0.5)
+        self.roi_refresh_interval = config['hand_detection'].get('roi_refresh_interval', 30)
+        self.roi = None  # (x_min, y_min, x_max, y_max) in full-frame pixels
+        self.frames_since_full_search = 0
+        
+        # Keyframe mode: full model every N frames, optical flow in between
+        self.keyframe_interval = config['hand_detection'].get('keyframe_interval', 1)
+        self.flow_min_tracked = config['hand_detection'].get('flow_min_tracked', 0.8)
+        self.flow_max_error = config['hand_detection'].get('flow_max_error', 20.0)
+        self.frames_since_keyframe = 0
+        self.prev_gray = None
+        self.tracked_hands = []  # (label, points (21, 2) in inference pixels, z values)
+        
+        # Landmark arrays, preallocated per hand slot and reused every frame
+        max_hands = config['hand_detection']['max_hands']
+        self.raw_landmarks = [HandLandmarks() for _ in range(max_hands)]
+        self.smoothed_landmarks = [HandLandmarks() for _ in range(max_hands)]
+        
+        # Persistent hand identities; per-hand state is keyed by track ID
+        self.tracker = HandTracker(
+            max_distance=config['hand_detection'].get('track_max_distance', 0.2),
+            max_age=config['hand_detection'].get('track_max_age', 0.5)
         )
         
-        # Smoothing buffers for each landmark
-        self.smoothing_factor = config['hand_detection']['smoothing_factor']
-        self.landmark_buffers = {}
-        self.buffer_size = 5
+        # One Euro landmark filter for each live track
+        self.filter_params = {
+            'min_cutoff': config['hand_detection'].get('filter_min_cutoff', 1.5),
+            'beta': config['hand_detection'].get('filter_beta', 10.0),
+            'd_cutoff': config['hand_detection'].get('filter_d_cutoff', 1.0)
+        }
+        self.landmark_filters = {}
         
         # FPS calculation
         self.prev_time = 0
@@ -34,198 +66,285 @@ class HandDetector:
         # Hand data storage
         self.hands_data = []
         
-    def process_frame(self, frame):
+    def process_frame(self, frame, timestamp=None):
         """
         Process video frame and extract hand landmarks
+        The frame is returned untouched; overlays are drawn by the UI
+        Args:
+            frame: BGR frame
+            timestamp: Capture time in seconds (time.monotonic()); defaults to now
         Returns: processed frame, hands data
         """
-        start_time = time.time()
+        if timestamp is None:
+            timestamp = time.monotonic()
         
-        # Convert BGR to RGB for Mediapipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        rgb_frame.flags.writeable = False
+        # Between keyframes, landmarks are propagated with optical flow
+        detections = None
+        if self.keyframe_interval > 1:
+            with profiler.stage('flow'):
+                detections = self._track_with_flow(frame)
         
-        # Detect hands
-        results = self.hands.process(rgb_frame)
-        
-        rgb_frame.flags.writeable = True
-        frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+        if detections is None:
+            detections = self._detect_keyframe(frame, timestamp)
         
         # Reset hands data
         self.hands_data = []
         
-        if results.multi_hand_landmarks:
-            for hand_idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                # Get hand label (Left/Right)
-                hand_label = results.multi_handedness[hand_idx].classification[0].label
-                
-                # Extract and process landmarks
-                landmarks = self._extract_landmarks(hand_landmarks, frame.shape)
+        # Smooth landmarks, keyed by persistent track
+        with profiler.stage('smoothing'):
+            track_ids = self.tracker.update(detections, timestamp)
+            smoothed = [
+                self._smooth_landmarks(landmarks, hand_idx, track_ids[hand_idx], timestamp)
+                for hand_idx, (_, landmarks) in enumerate(detections)
+            ]
+        
+        # Calculate additional features
+        with profiler.stage('features'):
+            for hand_idx, (hand_label, landmarks) in enumerate(detections):
+                track_id = track_ids[hand_idx]
+                smoothed_landmarks = smoothed[hand_idx]
                 
-                # Smooth landmarks
-                smoothed_landmarks = self._smooth_landmarks(landmarks, hand_idx)
-                
-                # Calculate additional features
                 hand_data = {
                     'label': hand_label,
+                    'track_id': track_id,
                     'landmarks': smoothed_landmarks,
                     'raw_landmarks': landmarks,
-                    'features': self._calculate_features(smoothed_landmarks),
+                    'velocity': self.landmark_filters[track_id].velocity,
+                    'features': calculate_features(smoothed_landmarks),
                     'bbox': self._get_bounding_box(smoothed_landmarks, frame.shape)
                 }
                 
                 self.hands_data.append(hand_data)
-                
-                # Draw landmarks on frame
-                if self.config['ui']['show_landmarks']:
-                    self._draw_landmarks(frame, hand_landmarks, hand_label)
+        
+        # Drop filters of expired tracks
+        for track_id in [t for t in self.landmark_filters if t not in self.tracker.tracks]:
+            del self.landmark_filters[track_id]
+        
+        if self.roi_tracking:
+            self._update_roi(frame.shape)
         
         # Calculate FPS
         self._calculate_fps()
         
         return frame, self.hands_data
     
-    def _extract_landmarks(self, hand_landmarks, frame_shape):
-        """Extract 21 landmarks with normalized and pixel coordinates"""
-        h, w, _ = frame_shape
-        landmarks = []
-        
-        for idx, landmark in enumerate(hand_landmarks.landmark):
-            # Normalized coordinates (0-1)
-            norm_x = landmark.x
-            norm_y = landmark.y
-            norm_z = landmark.z
-            
-            # Pixel coordinates
-            px = int(norm_x * w)
-            py = int(norm_y * h)
-            
-            landmarks.append({
-                'id': idx,
-                'x': norm_x,
-                'y': norm_y,
-                'z': norm_z,
-                'px': px,
-                'py': py
-            })
-        
-        return landmarks
+    def _detect_keyframe(self, frame, timestamp):
+        """
+        Run the full landmark model
+        Returns: list of (label, landmarks) in full-frame coordinates
+        """
+        # Detect hands, inside the tracked ROI when there is one
+        roi = self._select_roi()
+        results = self._detect(frame, roi, timestamp)
+        
+        if roi and not results:
+            # Tracking lost - fall back to a full-frame search
+            roi = None
+            results = self._detect(frame, roi, timestamp)
+        
+        if roi is None:
+            self.frames_since_full_search = 0
+        
+        detections = []
+        with profiler.stage('extraction'):
+            for hand_idx, (hand_label, points) in enumerate(results[:len(self.raw_landmarks)]):
+                landmarks = self._extract_landmarks(
+                    points, frame.shape, roi, self.raw_landmarks[hand_idx]
+                )
+                detections.append((hand_label, landmarks))
+        
+        if self.keyframe_interval > 1:
+            self._start_flow_tracking(frame, detections)
+        
+        return detections
     
-    def _smooth_landmarks(self, landmarks, hand_idx):
-        """Apply exponential moving average smoothing"""
-        key = f"hand_{hand_idx}"
-        
-        if key not in self.landmark_buffers:
-            self.landmark_buffers[key] = deque(maxlen=self.buffer_size)
-        
-        buffer = self.landmark_buffers[key]
-        buffer.append(landmarks)
+    def _flow_gray(self, frame):
+        """Grayscale frame at inference resolution for optical flow"""
+        return cv2.cvtColor(self._inference_frame(frame), cv2.COLOR_BGR2GRAY)
+    
+    def _start_flow_tracking(self, frame, detections):
+        """Remember keyframe landmarks as the starting points for optical flow"""
+        self.prev_gray = self._flow_gray(frame)
+        gh, gw = self.prev_gray.shape
+        
+        self.tracked_hands = []
+        for hand_label, landmarks in detections:
+            points = landmarks.xy * np.array([gw, gh], dtype=np.float32)
+            z_values = landmarks.array[:, 2].copy()
+            self.tracked_hands.append((hand_label, points, z_values))
+        
+        self.frames_since_keyframe = 0
+    
+    def _track_with_flow(self, frame):
+        """
+        Propagate the last landmarks with sparse Lucas-Kanade optical flow
+        Returns: list of (label, landmarks), or None when a keyframe is needed
+        """
+        if not self.tracked_hands or self.frames_since_keyframe + 1 >= self.keyframe_interval:
+            return None
         
-        if len(buffer) < 2:
-            return landmarks
+        gray = self._flow_gray(frame)
+        if gray.shape != self.prev_gray.shape:
+            return None
         
-        # Apply smoothing
-        smoothed = []
-        alpha = self.smoothing_factor
+        prev_points = np.vstack([points for _, points, _ in self.tracked_hands])
+        next_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self.prev_gray, gray, prev_points.reshape(-1, 1, 2), None,
+            winSize=(21, 21), maxLevel=3
+        )
         
-        for i in range(21):
-            if len(buffer) == 1:
-                smoothed.append(landmarks[i])
-                continue
+        next_points = next_points.reshape(len(self.tracked_hands), 21, 2)
+        tracked = (status.reshape(len(self.tracked_hands), 21) == 1) & \
+                  (error.reshape(len(self.tracked_hands), 21) < self.flow_max_error)
+        
+        # Low tracking confidence on any hand - run the full model instead
+        if (tracked.mean(axis=1) < self.flow_min_tracked).any():
+            return None
+        
+        gh, gw = gray.shape
+        detections = []
+        for i, (hand_label, points, z_values) in enumerate(self.tracked_hands):
+            # Lost points follow the mean motion of the hand's tracked points
+            shift = (next_points[i][tracked[i]] - points[tracked[i]]).mean(axis=0)
+            moved = np.where(tracked[i][:, None], next_points[i], points + shift)
+            self.tracked_hands[i] = (hand_label, moved.astype(np.float32), z_values)
             
-            prev = buffer[-2][i]
-            curr = landmarks[i]
-            
-            smoothed_point = {
-                'id': i,
-                'x': alpha * curr['x'] + (1 - alpha) * prev['x'],
-                'y': alpha * curr['y'] + (1 - alpha) * prev['y'],
-                'z': alpha * curr['z'] + (1 - alpha) * prev['z'],
-                'px': int(alpha * curr['px'] + (1 - alpha) * prev['px']),
-                'py': int(alpha * curr['py'] + (1 - alpha) * prev['py'])
-            }
-            smoothed.append(smoothed_point)
-        
-        return smoothed
+            normalized = moved / np.array([gw, gh], dtype=np.float32)
+            detections.append((hand_label, self._landmarks_from_points(
+                normalized, z_values, frame.shape, self.raw_landmarks[i]
+            )))
+        
+        self.prev_gray = gray
+        self.frames_since_keyframe += 1
+        return detections
     
-    def _calculate_features(self, landmarks):
-        """Calculate geometric features for gesture recognition"""
-        features = {}
-        
-        # Finger tips: thumb(4), index(8), middle(12), ring(16), pinky(20)
-        finger_tips = [4, 8, 12, 16, 20]
-        finger_pips = [2, 6, 10, 14, 18]  # Proximal joints
-        
-        # Calculate which fingers are extended
-        extended_fingers = []
-        for tip, pip in zip(finger_tips, finger_pips):
-            if landmarks[tip]['y'] < landmarks[pip]['y']:  # Tip above pip = extended
-                extended_fingers.append(1)
-            else:
-                extended_fingers.append(0)
-        
-        features['extended_fingers'] = extended_fingers
-        features['fingers_count'] = sum(extended_fingers)
-        
-        # Palm center (approximate)
-        palm_x = np.mean([landmarks[i]['x'] for i in [0, 5, 9, 13, 17]])
-        palm_y = np.mean([landmarks[i]['y'] for i in [0, 5, 9, 13, 17]])
-        features['palm_center'] = (palm_x, palm_y)
-        
-        # Hand orientation
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9]
-        features['orientation'] = np.arctan2(
-            middle_mcp['y'] - wrist['y'],
-            middle_mcp['x'] - wrist['x']
-        )
+    def _landmarks_from_points(self, points, z_values, frame_shape, out):
+        """Fill a landmark array from normalized (x, y) points and z values"""
+        h, w, _ = frame_shape
+        out.array[:, :2] = points
+        out.array[:, 2] = z_values
+        out.set_frame_size(w, h)
+        return out
+    
+    def _detect(self, frame, roi, timestamp):
+        """Run the backend on the whole frame or on the ROI crop"""
+        if roi is not None:
+            frame = frame[roi[1]:roi[3], roi[0]:roi[2]]
+        
+        # Convert BGR to RGB for Mediapipe (on a downscaled copy if configured)
+        with profiler.stage('convert'):
+            rgb_frame = cv2.cvtColor(self._inference_frame(frame), cv2.COLOR_BGR2RGB)
+            rgb_frame.flags.writeable = False
+        
+        with profiler.stage('inference'):
+            return self.backend.detect(rgb_frame, timestamp)
+    
+    def _select_roi(self):
+        """Return the ROI to search this frame, or None for a full-frame search"""
+        if not self.roi_tracking or self.roi is None:
+            return None
+        
+        self.frames_since_full_search += 1
         
-        # Distances between key points
-        features['distances'] = self._calculate_distances(landmarks)
+        # Periodically look at the whole frame so new hands are picked up
+        if (len(self.hands_data) < self.config['hand_detection']['max_hands'] and
+                self.frames_since_full_search >= self.roi_refresh_interval):
+            return None
         
-        return features
+        return self.roi
     
-    def _calculate_distances(self, landmarks):
-        """Calculate distances between key landmarks"""
-        distances = {}
+    def _update_roi(self, frame_shape):
+        """
+        Move the ROI to cover the tracked hands. The crop is only moved when a
+        hand gets close to its edge, so MediaPipe's own frame-to-frame tracking
+        keeps working in a stable coordinate frame.
+        """
+        if not self.hands_data:
+            self.roi = None
+            return
         
-        # Thumb to index tip
-        distances['thumb_index'] = self._euclidean_distance(
-            landmarks[4], landmarks[8]
+        h, w, _ = frame_shape
+        x_min = min(hand['bbox'][0] for hand in self.hands_data)
+        y_min = min(hand['bbox'][1] for hand in self.hands_data)
+        x_max = max(hand['bbox'][2] for hand in self.hands_data)
+        y_max = max(hand['bbox'][3] for hand in self.hands_data)
+        
+        if self.roi is not None:
+            # Keep the current crop while the hands stay inside its inner part
+            rx_min, ry_min, rx_max, ry_max = self.roi
+            margin_x = (rx_max - rx_min) * self.roi_expansion / (2 * (1 + self.roi_expansion))
+            margin_y = (ry_max - ry_min) * self.roi_expansion / (2 * (1 + self.roi_expansion))
+            if (x_min >= rx_min + margin_x / 2 and x_max <= rx_max - margin_x / 2 and
+                    y_min >= ry_min + margin_y / 2 and y_max <= ry_max - margin_y / 2):
+                return
+        
+        # Expand around the hands; use a square-ish crop so fingers fit when rotating
+        size = max(x_max - x_min, y_max - y_min) * (1 + self.roi_expansion)
+        cx = (x_min + x_max) / 2
+        cy = (y_min + y_max) / 2
+        roi = (
+            max(0, int(cx - size / 2)),
+            max(0, int(cy - size / 2)),
+            min(w, int(cx + size / 2)),
+            min(h, int(cy + size / 2))
         )
         
-        # Thumb to middle tip
-        distances['thumb_middle'] = self._euclidean_distance(
-            landmarks[4], landmarks[12]
-        )
+        # A crop covering most of the frame saves nothing
+        if (roi[2] - roi[0]) * (roi[3] - roi[1]) > 0.6 * w * h:
+            self.roi = None
+        else:
+            self.roi = roi
+    
+    def _inference_frame(self, frame):
+        """Downscale frame to the inference width, keeping aspect ratio"""
+        h, w = frame.shape[:2]
         
-        # Index to pinky tip
-        distances['index_pinky'] = self._euclidean_distance(
-            landmarks[8], landmarks[20]
-        )
+        if not self.inference_width or w <= self.inference_width:
+            return frame
         
-        # Wrist to middle finger tip
-        distances['wrist_middle'] = self._euclidean_distance(
-            landmarks[0], landmarks[12]
+        inference_height = int(round(h * self.inference_width / w))
+        return cv2.resize(
+            frame,
+            (self.inference_width, inference_height),
+            interpolation=cv2.INTER_AREA
         )
-        
-        return distances
     
-    def _euclidean_distance(self, p1, p2):
-        """Calculate Euclidean distance between two points"""
-        return np.sqrt((p1['x'] - p2['x'])**2 + (p1['y'] - p2['y'])**2)
+    def _extract_landmarks(self, points, frame_shape, roi, out):
+        """
+        Copy 21 normalized backend landmarks into a preallocated HandLandmarks
+        Landmarks found in an ROI crop are mapped back to full-frame coordinates
+        """
+        h, w, _ = frame_shape
+        array = out.array
+        array[:] = points
+        
+        if roi is not None:
+            scale_x = (roi[2] - roi[0]) / w
+            scale_y = (roi[3] - roi[1]) / h
+            array[:, 0] = roi[0] / w + array[:, 0] * scale_x
+            array[:, 1] = roi[1] / h + array[:, 1] * scale_y
+            array[:, 2] *= scale_x  # z shares the x scale
+        
+        out.set_frame_size(w, h)
+        return out
+    
+    def _smooth_landmarks(self, landmarks, hand_idx, track_id, timestamp):
+        """Apply the track's One Euro filter into the hand slot's smoothed buffer"""
+        if track_id not in self.landmark_filters:
+            self.landmark_filters[track_id] = OneEuroFilter(**self.filter_params)
+        
+        smoothed = self.smoothed_landmarks[hand_idx]
+        smoothed.array[:] = self.landmark_filters[track_id].filter(landmarks.array, timestamp)
+        smoothed.set_frame_size(landmarks.width, landmarks.height)
+        return smoothed
     
     def _get_bounding_box(self, landmarks, frame_shape):
         """Calculate bounding box around hand"""
         h, w, _ = frame_shape
         
-        x_coords = [lm['x'] for lm in landmarks]
-        y_coords = [lm['y'] for lm in landmarks]
-        
-        x_min = int(min(x_coords) * w)
-        x_max = int(max(x_coords) * w)
-        y_min = int(min(y_coords) * h)
-        y_max = int(max(y_coords) * h)
+        xy = landmarks.xy
+        x_min, y_min = (xy.min(axis=0) * (w, h)).astype(int).tolist()
+        x_max, y_max = (xy.max(axis=0) * (w, h)).astype(int).tolist()
         
         # Add padding
         padding = 20
@@ -236,29 +355,6 @@ class HandDetector:
         
         return (x_min, y_min, x_max, y_max)
     
-    def _draw_landmarks(self, frame, hand_landmarks, hand_label):
-        """Draw hand landmarks and connections on frame"""
-        self.mp_drawing.draw_landmarks(
-            frame,
-            hand_landmarks,
-            self.mp_hands.HAND_CONNECTIONS,
-            self.mp_drawing_styles.get_default_hand_landmarks_style(),
-            self.mp_drawing_styles.get_default_hand_connections_style()
-        )
-        
-        # Draw hand label
-        h, w, _ = frame.shape
-        wrist = hand_landmarks.landmark[0]
-        cv2.putText(
-            frame,
-            hand_label,
-            (int(wrist.x * w), int(wrist.y * h) - 20),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
-            (0, 255, 0),
-            2
-        )
-    
     def _calculate_fps(self):
         """Calculate and update FPS"""
         current_time = time.time()
@@ -269,6 +365,31 @@ class HandDetector:
         """Return current FPS"""
         return int(self.fps)
     
+    def warm_up(self, width, height, num_frames=3):
+        """
+        Run the backend on blank frames so graph setup and model loading
+        happen before the first real frame
+        Args:
+            width, height: Camera resolution (frames take the same resize path)
+            num_frames: Number of dummy frames
+        Returns: list of per-frame latencies in ms
+        """
+        if not self.backend.needs_warm_up or num_frames <= 0:
+            return []
+        
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        latencies = []
+        for _ in range(num_frames):
+            start = time.perf_counter()
+            self._detect(frame, None, time.monotonic())
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        logger.info(
+            f"Hand detector warmed up: first frame {latencies[0]:.0f} ms, "
+            f"last {latencies[-1]:.0f} ms"
+        )
+        return latencies
+    
     def release(self):
         """Release resources"""
-        self.hands.close()
\ No newline at end of file
+        self.backend.close()
\ No newline at end of file
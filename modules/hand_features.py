@@ -0,0 +1,107 @@
+"""
+Hand Feature Engine
+Computes geometric hand features from a (21, 3) landmark array in a handful
+of NumPy operations: finger extension flags, palm center, orientation, the
+full 21x21 pairwise distance matrix and the angle at every finger joint,
+plus how clearly each finger is extended or curled (finger margins).
+"""
+
+import numpy as np
+
+
+# Landmark indices
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])
+FINGER_PIPS = np.array([2, 6, 10, 14, 18])  # Proximal joints
+PALM_POINTS = np.array([0, 5, 9, 13, 17])
+FINGER_BITS = 1 << np.arange(5)  # Bit i of finger_mask = finger i extended
+WRIST = 0
+MIDDLE_MCP = 9
+
+# Named distances kept in features['distances']
+KEY_DISTANCES = {
+    'thumb_index': (4, 8),
+    'thumb_middle': (4, 12),
+    'index_pinky': (8, 20),
+    'wrist_middle': (0, 12),
+}
+
+# Wrist -> tip chain of each finger; angles are measured at the three inner joints
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],       # Thumb
+    [0, 5, 6, 7, 8],       # Index
+    [0, 9, 10, 11, 12],    # Middle
+    [0, 13, 14, 15, 16],   # Ring
+    [0, 17, 18, 19, 20],   # Pinky
+])
+# (3, 15) index triplets: previous point, joint, next point
+JOINT_TRIPLETS = np.stack([
+    FINGER_CHAINS[:, :3].ravel(),
+    FINGER_CHAINS[:, 1:4].ravel(),
+    FINGER_CHAINS[:, 2:].ravel(),
+])
+
+
+def distance_matrix(xy):
+    """
+    Pairwise 2D distances between all landmarks
+    Args:
+        xy: (21, 2) normalized x, y
+    Returns:
+        (21, 21) float64 matrix
+    """
+    dx = xy[:, 0, None] - xy[None, :, 0]
+    dy = xy[:, 1, None] - xy[None, :, 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def joint_angles(xy):
+    """
+    Angle in degrees (0-180) at each finger joint, same convention as
+    utils.preprocessing.calculate_angle
+    Args:
+        xy: (21, 2) normalized x, y
+    Returns:
+        (5, 3) array, one row per finger (thumb..pinky), MCP/PIP/DIP columns
+    """
+    points = xy[JOINT_TRIPLETS]
+    (px, py), (nx, ny) = (points[[0, 2]] - points[1]).transpose(0, 2, 1)
+    angles = np.arctan2(px * ny - py * nx, px * nx + py * ny)
+    return np.degrees(np.abs(angles)).reshape(5, 3)
+
+
+def calculate_features(landmarks):
+    """
+    Calculate geometric features for gesture recognition
+    Args:
+        landmarks: HandLandmarks or (21, 3) array of normalized x, y, z
+    Returns:
+        Features dict
+    """
+    array = getattr(landmarks, 'array', landmarks)
+    xy = array[:, :2].astype(np.float64)
+
+    # Tip above pip = extended
+    extended = xy[FINGER_TIPS, 1] < xy[FINGER_PIPS, 1]
+    extended_fingers = extended.astype(int).tolist()
+    finger_mask = int(FINGER_BITS[extended].sum())
+
+    palm_x, palm_y = xy[PALM_POINTS].mean(axis=0)
+    wrist_to_middle = xy[MIDDLE_MCP] - xy[WRIST]
+
+    distances = distance_matrix(xy)
+
+    # Signed tip-above-PIP height in palm lengths (> 0 = extended)
+    palm_length = max(distances[WRIST, MIDDLE_MCP], 1e-6)
+    finger_margins = (xy[FINGER_PIPS, 1] - xy[FINGER_TIPS, 1]) / palm_length
+
+    return {
+        'extended_fingers': extended_fingers,
+        'fingers_count': sum(extended_fingers),
+        'finger_mask': finger_mask,
+        'finger_margins': finger_margins,
+        'palm_center': (palm_x, palm_y),
+        'orientation': np.arctan2(wrist_to_middle[1], wrist_to_middle[0]),
+        'distances': {name: distances[i, j] for name, (i, j) in KEY_DISTANCES.items()},
+        'distance_matrix': distances,
+        'joint_angles': joint_angles(xy),
+    }
@@ -0,0 +1,80 @@
+"""
+Hand Tracker
+Gives each hand a persistent track ID by matching palm positions between
+frames, so per-hand state (filters, gesture history) follows the hand rather
+than MediaPipe's result order. Tracks not seen for a while are expired.
+"""
+
+import numpy as np
+
+from modules.hand_features import PALM_POINTS
+
+
+class HandTracker:
+    """Greedy nearest-palm matcher with track expiry"""
+
+    def __init__(self, max_distance=0.2, max_age=0.5):
+        """
+        Args:
+            max_distance: Largest palm movement (normalized units) between
+                sightings that still counts as the same hand
+            max_age: Seconds a track survives without being matched
+        """
+        self.max_distance = max_distance
+        self.max_age = max_age
+
+        self.tracks = {}  # track_id -> {'label', 'position', 'last_seen'}
+        self.next_id = 0
+
+    def update(self, hands, timestamp):
+        """
+        Match this frame's hands to existing tracks
+        Args:
+            hands: List of (label, landmarks) with landmarks a HandLandmarks
+            timestamp: Frame time in seconds
+        Returns:
+            List of track IDs, aligned with hands
+        """
+        positions = [landmarks.xy[PALM_POINTS].mean(axis=0) for _, landmarks in hands]
+
+        # Candidate pairs, cheapest first; a handedness flip costs extra
+        candidates = []
+        for hand_idx, (label, _) in enumerate(hands):
+            for track_id, track in self.tracks.items():
+                distance = float(np.linalg.norm(positions[hand_idx] - track['position']))
+                if track['label'] != label:
+                    distance += self.max_distance / 2
+                if distance <= self.max_distance:
+                    candidates.append((distance, hand_idx, track_id))
+        candidates.sort()
+
+        track_ids = [None] * len(hands)
+        for _, hand_idx, track_id in candidates:
+            if track_ids[hand_idx] is None and track_id not in track_ids:
+                track_ids[hand_idx] = track_id
+
+        for hand_idx, (label, _) in enumerate(hands):
+            if track_ids[hand_idx] is None:
+                track_ids[hand_idx] = self.next_id
+                self.next_id += 1
+            self.tracks[track_ids[hand_idx]] = {
+                'label': label,
+                'position': positions[hand_idx],
+                'last_seen': timestamp
+            }
+
+        self._expire(timestamp)
+        return track_ids
+
+    def _expire(self, timestamp):
+        """Drop tracks that have not been seen for max_age seconds"""
+        stale = [
+            track_id for track_id, track in self.tracks.items()
+            if timestamp - track['last_seen'] > self.max_age
+        ]
+        for track_id in stale:
+            del self.tracks[track_id]
+
+    def reset(self):
+        """Forget all tracks"""
+        self.tracks = {}
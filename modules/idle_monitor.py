@@ -0,0 +1,104 @@
+"""
+Idle Monitor
+Drops the pipeline into a low-power idle state when no hands have been seen
+for a while, and wakes it when a cheap frame-difference detector sees motion
+"""
+
+import time
+
+import cv2
+
+from utils.logger import logger
+
+
+class MotionDetector:
+    """Frame-difference motion detector on a tiny grayscale copy"""
+
+    def __init__(self, width=160, pixel_threshold=25, area_threshold=0.01):
+        """
+        Args:
+            width: Width frames are downscaled to before differencing
+            pixel_threshold: Per-pixel intensity change counted as motion
+            area_threshold: Fraction of changed pixels that counts as motion
+        """
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.previous = None
+
+    def detect(self, frame):
+        """Return True if this frame differs enough from the previous one"""
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (self.width, max(1, h * self.width // w)),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+
+        # No reference yet, or the frame size changed (new resolution, source switch)
+        if self.previous is None or gray.shape != self.previous.shape:
+            self.previous = gray
+            return False
+
+        diff = cv2.absdiff(gray, self.previous)
+        self.previous = gray
+
+        changed = cv2.countNonZero(cv2.threshold(
+            diff, self.pixel_threshold, 255, cv2.THRESH_BINARY
+        )[1])
+        return changed > self.area_threshold * diff.size
+
+    def reset(self):
+        """Forget the reference frame"""
+        self.previous = None
+
+
+class IdleMonitor:
+    """Active/idle state machine driven by hand presence and motion"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: Application config; reads the optional 'idle' section
+        """
+        idle_config = config.get('idle', {})
+        self.enabled = idle_config.get('enabled', True)
+        self.timeout = idle_config.get('timeout', 10.0)
+        self.idle_fps = idle_config.get('fps', 5)
+
+        self.motion_detector = MotionDetector(
+            area_threshold=idle_config.get('motion_threshold', 0.01)
+        )
+
+        self.is_idle = False
+        self.last_hand_time = time.monotonic()
+
+    def update(self, hands_count, now=None):
+        """
+        Feed the hand count of a fully processed frame
+        Returns: True if the monitor just entered idle
+        """
+        now = time.monotonic() if now is None else now
+
+        if hands_count > 0:
+            self.last_hand_time = now
+            return False
+
+        if self.enabled and not self.is_idle and now - self.last_hand_time >= self.timeout:
+            self.is_idle = True
+            self.motion_detector.reset()
+            logger.info(f"No hands for {self.timeout:.0f}s - entering idle mode")
+            return True
+
+        return False
+
+    def check_motion(self, frame, now=None):
+        """
+        While idle, test a frame for motion
+        Returns: True if motion woke the pipeline up
+        """
+        if not self.motion_detector.detect(frame):
+            return False
+
+        self.is_idle = False
+        self.last_hand_time = time.monotonic() if now is None else now
+        logger.info("Motion detected - leaving idle mode")
+        return True
@@ -0,0 +1,241 @@
+"""
+Multi-Process Inference Pool
+Runs HandDetector in worker processes so detection is not limited to the
+one core the GIL allows. Frames travel through shared-memory slots (one
+copy, no pickling); only the small hands_data results are pickled back.
+Results are re-assembled in frame order using sequence numbers.
+
+Each worker owns its own MediaPipe graph and smoothing state and receives
+frames round-robin, so with N workers every worker tracks every Nth frame.
+Worker track IDs are therefore local; the pool re-assigns track IDs on the
+ordered results so they stay consistent downstream. Losing any worker loses
+every Nth frame, so the pool fails as a whole: blocking calls raise
+RuntimeError once a worker has exited (or the pool was cancelled).
+"""
+
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from modules.hand_tracker import HandTracker
+from utils.logger import logger
+
+
+def _inference_worker(config, task_queue, result_queue, log_queue):
+    """Worker process: attach to frame slots and run hand detection"""
+    logger.use_queue(log_queue)
+
+    from modules.hand_detector import HandDetector
+
+    detector = HandDetector(config)
+    detector.warm_up(config['camera']['width'], config['camera']['height'],
+                     config['hand_detection'].get('warmup_frames', 3))
+    attached = {}
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            sequence, slot_name, shape, dtype, timestamp = task
+            if slot_name not in attached:
+                attached[slot_name] = shared_memory.SharedMemory(name=slot_name)
+
+            frame = np.ndarray(shape, dtype=dtype, buffer=attached[slot_name].buf)
+            _, hands_data = detector.process_frame(frame, timestamp)
+            result_queue.put((sequence, slot_name, hands_data))
+    finally:
+        detector.release()
+        for shm in attached.values():
+            shm.close()
+
+
+class InferencePool:
+    """Pool of detector processes fed through shared-memory frame slots"""
+
+    def __init__(self, config, num_workers=2, slots_per_worker=2):
+        """
+        Args:
+            config: Application config passed to each worker's HandDetector
+            num_workers: Number of detector processes
+            slots_per_worker: Frames that may be in flight per worker
+        """
+        self.config = config
+        self.num_workers = num_workers
+        self.num_slots = num_workers * slots_per_worker
+
+        # Spawn: MediaPipe graphs are not fork-safe
+        context = mp_proc.get_context('spawn')
+        self.task_queues = [context.Queue() for _ in range(num_workers)]
+        self.result_queue = context.Queue()
+        self.log_queue = context.Queue()  # Worker log records -> this process's log file
+        self.log_listener = None
+        self.workers = [
+            context.Process(
+                target=_inference_worker,
+                args=(config, self.task_queues[i], self.result_queue, self.log_queue),
+                name=f"InferenceWorker-{i}",
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+
+        self.slots = {}            # name -> SharedMemory block
+        self.free_slots = []
+        self.slot_size = 0
+
+        self.next_sequence = 0     # Next sequence number to submit
+        self.next_to_emit = 0      # Next sequence number to hand back
+        self.in_flight = {}        # sequence -> (frame, timestamp)
+        self.completed = {}        # sequence -> hands_data
+        self.cancelled = False     # Set from another thread to abort blocking calls
+
+        self.tracker = HandTracker(
+            max_distance=config['hand_detection'].get('track_max_distance', 0.2),
+            max_age=config['hand_detection'].get('track_max_age', 0.5)
+        )
+
+        # FPS calculation (completed frames)
+        self.prev_time = 0
+        self.fps = 0
+
+    def start(self):
+        """Start worker processes"""
+        self.log_listener = logger.listen(self.log_queue)
+        for worker in self.workers:
+            worker.start()
+        logger.info(f"Inference pool started with {self.num_workers} workers")
+
+    def cancel(self):
+        """Make blocking submit()/collect() calls raise (safe from any thread)"""
+        self.cancelled = True
+
+    def submit(self, frame, timestamp):
+        """
+        Copy a frame into a free slot and queue it for detection
+        Blocks while all slots are in flight
+        Returns: sequence number
+        Raises:
+            RuntimeError: A worker exited or the pool was cancelled while waiting
+        """
+        if frame.nbytes > self.slot_size:
+            self._allocate_slots(frame.nbytes)
+
+        while not self.free_slots:
+            self._receive(block=True)
+
+        slot = self.free_slots.pop()
+        np.ndarray(frame.shape, dtype=frame.dtype, buffer=slot.buf)[:] = frame
+
+        sequence = self.next_sequence
+        self.next_sequence += 1
+        self.in_flight[sequence] = (frame, timestamp)
+
+        worker = sequence % self.num_workers
+        self.task_queues[worker].put((sequence, slot.name, frame.shape, frame.dtype.str, timestamp))
+        return sequence
+
+    def collect(self, block=False):
+        """
+        Gather finished results
+        Args:
+            block: Wait for at least the next in-order result
+        Returns: list of (frame, timestamp, hands_data) in submission order
+        """
+        self._receive(block=False)
+        while block and self.next_to_emit in self.in_flight and \
+                self.next_to_emit not in self.completed:
+            self._receive(block=True)
+
+        ready = []
+        while self.next_to_emit in self.completed:
+            hands_data = self.completed.pop(self.next_to_emit)
+            frame, timestamp = self.in_flight.pop(self.next_to_emit)
+
+            track_ids = self.tracker.update(
+                [(hand['label'], hand['landmarks']) for hand in hands_data], timestamp
+            )
+            for hand, track_id in zip(hands_data, track_ids):
+                hand['track_id'] = track_id
+
+            ready.append((frame, timestamp, hands_data))
+            self.next_to_emit += 1
+            self._calculate_fps()
+
+        return ready
+
+    def _receive(self, block):
+        """Move results from the worker queue into the reorder buffer"""
+        while True:
+            try:
+                sequence, slot_name, hands_data = self.result_queue.get(
+                    block=block, timeout=1.0 if block else None
+                )
+            except queue.Empty:
+                if not block:
+                    return
+                self._check_workers()
+                continue
+
+            self.completed[sequence] = hands_data
+            if slot_name in self.slots:
+                self.free_slots.append(self.slots[slot_name])
+            block = False  # Got one; drain the rest without waiting
+
+    def _check_workers(self):
+        """Raise if waiting for results can no longer succeed"""
+        if self.cancelled:
+            raise RuntimeError("Inference pool cancelled")
+
+        # A dead worker's in-flight frames never come back, so ordered results stall
+        for worker in self.workers:
+            if not worker.is_alive():
+                raise RuntimeError(f"{worker.name} exited (exit code {worker.exitcode})")
+
+    def _allocate_slots(self, size):
+        """(Re)create shared-memory slots large enough for size-byte frames"""
+        # Old slots may only go once no worker is still reading them
+        while len(self.free_slots) < len(self.slots):
+            self._receive(block=True)
+
+        self._release_slots()
+        for _ in range(self.num_slots):
+            slot = shared_memory.SharedMemory(create=True, size=size)
+            self.slots[slot.name] = slot
+        self.free_slots = list(self.slots.values())
+        self.slot_size = size
+
+    def _release_slots(self):
+        for slot in self.slots.values():
+            slot.close()
+            slot.unlink()
+        self.slots = {}
+        self.free_slots = []
+
+    def _calculate_fps(self):
+        """Calculate and update FPS"""
+        current_time = time.time()
+        self.fps = 1 / (current_time - self.prev_time) if self.prev_time > 0 else 0
+        self.prev_time = current_time
+
+    def get_fps(self):
+        """Return current FPS"""
+        return int(self.fps)
+
+    def release(self):
+        """Stop workers and free shared memory"""
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+        self._release_slots()
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            self.log_listener = None
+        logger.info("Inference pool stopped")
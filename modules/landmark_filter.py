@@ -0,0 +1,78 @@
+"""
+Landmark Filter
+Vectorized One Euro filter over a whole (21, 3) landmark array. The cutoff
+frequency rises with speed, so slow hands are smoothed hard (no jitter) while
+fast hands are followed closely (little lag). The filtered derivative doubles
+as a per-landmark velocity estimate.
+
+Reference: Casiez, Roussel, Vogel - "1 Euro Filter" (CHI 2012)
+"""
+
+import math
+
+import numpy as np
+
+from modules.landmarks import NUM_LANDMARKS
+
+
+def _smoothing_alpha(cutoff, dt):
+    """Exponential smoothing factor for a cutoff frequency (Hz) and time step (s)"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One Euro filter applied element-wise to a landmark array"""
+
+    def __init__(self, min_cutoff=1.5, beta=10.0, d_cutoff=1.0, shape=(NUM_LANDMARKS, 3)):
+        """
+        Args:
+            min_cutoff: Cutoff frequency (Hz) at rest; lower = less jitter
+            beta: Cutoff increase per unit of speed (normalized units/s); higher = less lag
+            d_cutoff: Cutoff frequency (Hz) used to smooth the velocity
+            shape: Shape of the filtered array
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        self.value = np.zeros(shape, dtype=np.float32)
+        self.velocity = np.zeros(shape, dtype=np.float32)  # units per second
+        self.last_time = None
+
+    def reset(self):
+        """Forget the filter state; the next sample passes through unfiltered"""
+        self.velocity[:] = 0
+        self.last_time = None
+
+    def filter(self, sample, timestamp):
+        """
+        Filter one sample
+        Args:
+            sample: Array of the filter's shape
+            timestamp: Sample time in seconds
+        Returns:
+            Filtered array (the filter's own buffer - copy to keep it)
+        """
+        if self.last_time is None:
+            self.value[:] = sample
+            self.velocity[:] = 0
+            self.last_time = timestamp
+            return self.value
+
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            return self.value
+        self.last_time = timestamp
+
+        # Velocity from the last filtered value, itself low-pass filtered
+        raw_velocity = (sample - self.value) / dt
+        self.velocity += _smoothing_alpha(self.d_cutoff, dt) * (raw_velocity - self.velocity)
+
+        # Speed-adaptive cutoff, per element
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        alpha = 1.0 / (1.0 + tau / dt)
+
+        self.value += alpha * (sample - self.value)
+        return self.value
@@ -0,0 +1,66 @@
+"""
+Landmark Predictor
+Extrapolates smoothed landmarks forward by the measured pipeline latency
+(capture -> recognition), using the landmark filter's velocity estimate, so
+gestures are judged on where the hand is now rather than where it was when
+the frame was exposed.
+"""
+
+import time
+
+from modules.hand_features import PALM_POINTS
+from modules.landmarks import HandLandmarks
+
+
+class LandmarkPredictor:
+    """Constant-velocity extrapolation by a running latency estimate"""
+
+    def __init__(self, config):
+        """
+        Args:
+            config: Application config; reads the optional 'prediction' section
+        """
+        prediction_config = config.get('prediction', {})
+        self.enabled = prediction_config.get('enabled', False)
+        self.max_lead = prediction_config.get('max_lead_ms', 100) / 1000.0
+        self.latency_alpha = prediction_config.get('latency_smoothing', 0.1)
+
+        self.latency = None  # Smoothed capture -> recognition latency (s)
+        self.predicted_landmarks = []  # Reused output buffers, one per hand
+
+    def update(self, hands_data, capture_time, now=None):
+        """
+        Measure latency for this frame and add predicted positions to each hand
+        Adds 'predicted_landmarks' and 'predicted_palm_center' to every entry
+        Args:
+            hands_data: Hands from HandDetector (with 'landmarks' and 'velocity')
+            capture_time: time.monotonic() at which the frame was captured
+        Returns:
+            Lead time applied, in seconds
+        """
+        now = time.monotonic() if now is None else now
+        latency = max(0.0, now - capture_time)
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.latency_alpha * (latency - self.latency)
+
+        lead = min(self.latency, self.max_lead) if self.enabled else 0.0
+
+        while len(self.predicted_landmarks) < len(hands_data):
+            self.predicted_landmarks.append(HandLandmarks())
+
+        for hand, predicted in zip(hands_data, self.predicted_landmarks):
+            landmarks = hand['landmarks']
+            predicted.array[:] = landmarks.array + hand['velocity'] * lead
+            predicted.set_frame_size(landmarks.width, landmarks.height)
+
+            palm_x, palm_y = predicted.xy[PALM_POINTS].mean(axis=0)
+            hand['predicted_landmarks'] = predicted
+            hand['predicted_palm_center'] = (float(palm_x), float(palm_y))
+
+        return lead
+
+    def get_latency_ms(self):
+        """Return smoothed pipeline latency in milliseconds"""
+        return 0.0 if self.latency is None else self.latency * 1000.0
@@ -0,0 +1,124 @@
+"""
+Array-Backed Hand Landmarks
+Holds the 21 landmarks of a hand as one (21, 3) float32 array of normalized
+x, y, z. Pixel coordinates are derived on demand. Indexing returns a
+lightweight read-only view that still behaves like the old landmark dicts
+({'id', 'x', 'y', 'z', 'px', 'py'}), so existing code keeps working.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+
+NUM_LANDMARKS = 21
+
+# Landmark index pairs joined by bones (same as MediaPipe's HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),           # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),           # Index
+    (5, 9), (9, 10), (10, 11), (11, 12),      # Middle
+    (9, 13), (13, 14), (14, 15), (15, 16),    # Ring
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20)  # Pinky
+)
+
+
+class LandmarkPoint(Mapping):
+    """Read-only dict-style view of one landmark in a HandLandmarks array"""
+
+    __slots__ = ('_hand', '_idx')
+
+    _KEYS = ('id', 'x', 'y', 'z', 'px', 'py')
+
+    def __init__(self, hand, idx):
+        self._hand = hand
+        self._idx = idx
+
+    def __getitem__(self, key):
+        row = self._hand.array[self._idx]
+        if key == 'x':
+            return float(row[0])
+        if key == 'y':
+            return float(row[1])
+        if key == 'z':
+            return float(row[2])
+        if key == 'px':
+            return int(row[0] * self._hand.width)
+        if key == 'py':
+            return int(row[1] * self._hand.height)
+        if key == 'id':
+            return self._idx
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class HandLandmarks:
+    """21 hand landmarks in a preallocated (21, 3) float32 array"""
+
+    __slots__ = ('array', 'width', 'height')
+
+    def __init__(self, array=None, width=1, height=1):
+        """
+        Args:
+            array: Optional (21, 3) array of normalized x, y, z to wrap
+            width, height: Frame size used to derive pixel coordinates
+        """
+        self.array = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32) if array is None else array
+        self.width = width
+        self.height = height
+
+    def set_frame_size(self, width, height):
+        self.width = width
+        self.height = height
+
+    @property
+    def xy(self):
+        """(21, 2) view of normalized x, y"""
+        return self.array[:, :2]
+
+    @property
+    def pixels(self):
+        """(21, 2) int32 pixel coordinates, computed on demand"""
+        return (self.array[:, :2] * (self.width, self.height)).astype(np.int32)
+
+    def copy(self):
+        """Independent copy (buffers are reused every frame)"""
+        return HandLandmarks(self.array.copy(), self.width, self.height)
+
+    def to_dicts(self):
+        """Materialize as the legacy list of landmark dicts"""
+        return [dict(point) for point in self]
+
+    def __len__(self):
+        return NUM_LANDMARKS
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [LandmarkPoint(self, i) for i in range(NUM_LANDMARKS)[idx]]
+        if idx < 0:
+            idx += NUM_LANDMARKS
+        if not 0 <= idx < NUM_LANDMARKS:
+            raise IndexError(idx)
+        return LandmarkPoint(self, idx)
+
+    def __iter__(self):
+        return (LandmarkPoint(self, i) for i in range(NUM_LANDMARKS))
+
+    def __repr__(self):
+        return f"HandLandmarks({self.width}x{self.height}, {self.array.tolist()})"
+
+
+def overlay_points(hands_data):
+    """
+    Snapshot hands for drawing on the UI thread (detector buffers are reused)
+    Returns: list of (label, (21, 2) normalized x, y)
+    """
+    return [(hand['label'], hand['raw_landmarks'].xy.copy()) for hand in hands_data]
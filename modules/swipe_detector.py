@@ -0,0 +1,95 @@
+"""
+Swipe Detector
+Keeps the palm trajectory of the last `window` seconds in a fixed-size NumPy
+ring buffer of (timestamp, x, y) rows and tracks the displacement and velocity
+across that window incrementally, so each frame costs O(1) regardless of the
+window length and no per-frame history objects are allocated.
+"""
+
+import numpy as np
+
+
+class SwipeDetector:
+    """Straight-line swipes from palm displacement over a time window"""
+
+    def __init__(self, window=0.2, distance=0.10, dominance=2.0, min_samples=3, capacity=64):
+        """
+        Args:
+            window: Seconds of trajectory considered
+            distance: Minimum displacement (normalized units) for a swipe
+            dominance: How many times larger the main axis must be than the other
+            min_samples: Minimum frames in the window (rejects single-frame jumps)
+            capacity: Ring buffer rows; bounds the window at high frame rates
+        """
+        self.window = window
+        self.distance = distance
+        self.dominance = dominance
+        self.min_samples = min_samples
+
+        self.buffer = np.zeros((capacity, 3), dtype=np.float64)
+        self.start = 0  # Oldest row in the window
+        self.count = 0
+
+        # Newest minus oldest sample in the window
+        self.dx = 0.0
+        self.dy = 0.0
+        self.span = 0.0  # Seconds between oldest and newest sample
+
+    def add(self, timestamp, x, y):
+        """Append a palm position and drop samples older than the window"""
+        capacity = len(self.buffer)
+        if self.count == capacity:
+            # Full: overwrite the oldest sample
+            self.start = (self.start + 1) % capacity
+            self.count -= 1
+
+        self.buffer[(self.start + self.count) % capacity] = (timestamp, x, y)
+        self.count += 1
+
+        # Each sample is evicted at most once, so this is amortized O(1)
+        while self.count > 1 and timestamp - self.buffer[self.start, 0] > self.window:
+            self.start = (self.start + 1) % capacity
+            self.count -= 1
+
+        t0, x0, y0 = self.buffer[self.start]
+        self.dx = x - x0
+        self.dy = y - y0
+        self.span = timestamp - t0
+
+    @property
+    def velocity(self):
+        """Mean (vx, vy) over the window in normalized units per second"""
+        if self.span <= 0:
+            return 0.0, 0.0
+        return self.dx / self.span, self.dy / self.span
+
+    def detect(self):
+        """
+        Classify the current window
+        Returns:
+            (gesture_name, confidence) or (None, 0.0)
+        """
+        if self.count < self.min_samples:
+            return None, 0.0
+
+        dx, dy = self.dx, self.dy
+        if dx * dx + dy * dy < self.distance * self.distance:
+            return None, 0.0
+
+        abs_dx = abs(dx)
+        abs_dy = abs(dy)
+
+        if abs_dx > abs_dy * self.dominance:
+            return ('swipe_right' if dx > 0 else 'swipe_left'), 0.90
+
+        if abs_dy > abs_dx * self.dominance:
+            return ('swipe_down' if dy > 0 else 'swipe_up'), 0.90
+
+        return None, 0.0
+
+    def reset(self):
+        self.start = 0
+        self.count = 0
+        self.dx = 0.0
+        self.dy = 0.0
+        self.span = 0.0
@@ -4,13 +4,29 @@ Member 3: Automation Module
 Handles system automation using PyAutoGUI
 """
 
-import pyautogui
 import time
 import platform
 import subprocess
 from enum import Enum
 
 
+_pyautogui = None
+
+
+def _load_pyautogui():
+    """
+    Import PyAutoGUI on first use: importing it needs a display, which
+    headless runs (benchmark, dry run) do not have
+    """
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        pyautogui.FAILSAFE = True  # Move mouse to corner to abort
+        pyautogui.PAUSE = 0.1  # Pause between actions
+        _pyautogui = pyautogui
+    return _pyautogui
+
+
 class ControlMode(Enum):
     """Control modes for the system"""
     SLIDE_MODE = "slide"
@@ -25,10 +41,6 @@ class SystemController:
         self.config = config
         self.current_mode = ControlMode.SLIDE_MODE
         
-        # PyAutoGUI settings
-        pyautogui.FAILSAFE = True  # Move mouse to corner to abort
-        pyautogui.PAUSE = 0.1  # Pause between actions
-        
         # Action history
         self.action_history = []
         self.max_history = 50
@@ -39,6 +51,9 @@ class SystemController:
         # Scroll settings
         self.scroll_speed = config['system_control']['scroll_speed']
         
+        # Dry run: resolve and log actions without sending key presses
+        self.dry_run = config['system_control'].get('dry_run', False)
+        
         # Last action time (for logging)
         self.last_action_time = None
         
@@ -92,6 +107,8 @@ class SystemController:
             'hang_loose': 'scroll_down',     # 🤙 EASY scroll down!
             'three_thumb': 'browser_forward', # Alternative forward
             'four_fingers': 'browser_back',   # Alternative back
+            'pinch_in': 'zoom_out',
+            'pinch_out': 'zoom_in',
         }
         
         # Custom Mode Mappings (User configurable)
@@ -118,7 +135,7 @@ class SystemController:
         action = self._get_action_for_gesture(gesture_name)
         
         if action:
-            success = self._execute_action(action)
+            success = True if self.dry_run else self._execute_action(action)
             if success:
                 self._log_action(f"Gesture: {gesture_name} -> Action: {action}")
             return success
@@ -141,6 +158,8 @@ class SystemController:
     def _execute_action(self, action):
         """Execute the specified action"""
         try:
+            pyautogui = _load_pyautogui()
+            
             # Add delay for better reliability
             import time
             time.sleep(0.1)
@@ -226,6 +245,12 @@ class SystemController:
                 if platform.system() == 'Windows':
                     pyautogui.hotkey('win', 'shift', 's')
                 print("✓ Screenshot Tool")
+            elif action == 'zoom_in':
+                pyautogui.hotkey('ctrl', '+')
+                print("✓ Zoom IN")
+            elif action == 'zoom_out':
+                pyautogui.hotkey('ctrl', '-')
+                print("✓ Zoom OUT")
             
             # Custom Actions
             elif action.startswith('custom_action'):
@@ -246,6 +271,7 @@ class SystemController:
         try:
             if platform.system() == 'Windows':
                 # Use volume up/down keys
+                pyautogui = _load_pyautogui()
                 if delta > 0:
                     for _ in range(abs(delta) // 2):
                         pyautogui.press('volumeup')
@@ -0,0 +1,344 @@
+"""
+Trajectory Matcher
+Template-based dynamic gestures. Each template is a short trajectory of one
+input channel (palm position, or thumb-index pinch distance) resampled to a
+fixed number of points and normalized for position and scale. Every frame the
+last `duration` seconds of the live channel are normalized the same way and
+compared against the templates with dynamic time warping (Sakoe-Chiba band).
+
+Most comparisons never reach DTW: candidates are ordered by LB_Kim (first and
+last points, O(1)), then rejected by LB_Keogh (query against the template's
+precomputed band envelope, O(n)) when the bound already exceeds the best match
+so far, and DTW itself abandons a row as soon as it cannot win.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from utils.logger import logger
+
+
+TEMPLATE_POINTS = 32  # Samples per normalized trajectory
+
+# Channel -> (dimensions, minimum raw extent before a window is considered)
+# Extents: palm in image fractions, pinch in palm lengths
+CHANNELS = {
+    'palm': (2, 0.10),
+    'pinch': (1, 0.30),
+}
+
+
+def resample(values, points=TEMPLATE_POINTS):
+    """Linearly resample (n, d) samples, evenly spaced in time, to `points` rows"""
+    values = np.asarray(values, dtype=np.float64).reshape(len(values), -1)
+    source = np.linspace(0.0, 1.0, len(values))
+    target = np.linspace(0.0, 1.0, points)
+    return np.stack([np.interp(target, source, values[:, d]) for d in range(values.shape[1])], axis=1)
+
+
+def normalize(points):
+    """Remove position and scale: zero mean, largest axis extent 1"""
+    centered = points - points.mean(axis=0)
+    extent = np.ptp(points, axis=0).max()
+    return centered / extent if extent > 0 else centered
+
+
+def envelope(points, band):
+    """Upper and lower LB_Keogh envelopes of a (n, d) trajectory"""
+    padded = np.pad(points, ((band, band), (0, 0)), mode='edge')
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * band + 1, axis=0)
+    return windows.max(axis=-1), windows.min(axis=-1)
+
+
+def lb_kim(query, template):
+    """Lower bound from the first and last points (every warping path includes both)"""
+    first = query[0] - template[0]
+    last = query[-1] - template[-1]
+    return float(first @ first + last @ last)
+
+
+def lb_keogh(query, upper, lower):
+    """Lower bound from the query's distance outside the template envelope"""
+    above = np.maximum(query - upper, 0.0)
+    below = np.maximum(lower - query, 0.0)
+    return float((above * above + below * below).sum())
+
+
+def dtw_distance(query, template, band, limit=float('inf')):
+    """
+    Banded DTW with squared Euclidean point cost
+    Args:
+        query, template: (n, d) trajectories of equal length
+        band: Sakoe-Chiba band half-width in points
+        limit: Give up (return inf) once every path in a row exceeds this
+    Returns:
+        Sum of point costs along the best warping path
+    """
+    n = len(query)
+    diff = query[:, None, :] - template[None, :, :]
+    cost = (diff * diff).sum(axis=2).tolist()
+
+    inf = float('inf')
+    previous = [inf] * n
+    for i in range(n):
+        row = cost[i]
+        current = [inf] * n
+        row_min = inf
+        for j in range(max(0, i - band), min(n, i + band + 1)):
+            if i == 0 and j == 0:
+                best = 0.0
+            else:
+                best = previous[j]
+                if j > 0:
+                    if previous[j - 1] < best:
+                        best = previous[j - 1]
+                    if current[j - 1] < best:
+                        best = current[j - 1]
+            value = row[j] + best
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return inf
+        previous = current
+
+    return previous[n - 1]
+
+
+class TrajectoryTemplate:
+    """A normalized trajectory with its LB_Keogh envelope"""
+
+    __slots__ = ('name', 'channel', 'duration', 'threshold', 'points', 'upper', 'lower', 'builtin')
+
+    def __init__(self, name, channel, points, duration, threshold, band, builtin=False):
+        self.name = name
+        self.channel = channel
+        self.duration = duration
+        self.threshold = threshold  # Maximum mean point cost for a match
+        self.points = normalize(resample(points))
+        self.upper, self.lower = envelope(self.points, band)
+        self.builtin = builtin
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'channel': self.channel,
+            'duration': round(self.duration, 3),
+            'threshold': self.threshold,
+            'points': self.points.round(4).tolist()
+        }
+
+
+class TrajectoryBuffer:
+    """
+    Ring buffer of (timestamp, values) rows; every row is written twice so
+    the most recent samples are always one contiguous slice
+    """
+
+    def __init__(self, dims, capacity=128):
+        self.capacity = capacity
+        self.data = np.zeros((2 * capacity, dims + 1), dtype=np.float64)
+        self.reset()
+
+    def add(self, timestamp, values):
+        index = self.end % self.capacity
+        self.data[index, 0] = timestamp
+        self.data[index, 1:] = values
+        self.data[index + self.capacity] = self.data[index]
+        self.end = index + 1 + self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, duration):
+        """
+        Samples from the last `duration` seconds, plus the one before them
+        Returns:
+            (n, dims + 1) view, oldest first, or None if the buffer covers less
+            than `duration`
+        """
+        rows = self.data[self.end - self.count:self.end]
+        if self.count < 2 or rows[-1, 0] - rows[0, 0] < duration:
+            return None
+        start = np.searchsorted(rows[:, 0], rows[-1, 0] - duration, side='right') - 1
+        return rows[max(start, 0):]
+
+    def reset(self):
+        self.end = self.capacity  # One past the newest row, in (capacity, 2 * capacity]
+        self.count = 0
+
+
+class TrajectoryMatcher:
+    """Matches live channel trajectories against recorded templates"""
+
+    def __init__(self, band=4, capacity=128):
+        """
+        Args:
+            band: Sakoe-Chiba band half-width, in template points
+            capacity: Samples kept per channel (bounds the longest template
+                duration at high frame rates)
+        """
+        self.band = band
+        self.templates = []
+        self.buffers = {channel: TrajectoryBuffer(dims, capacity)
+                        for channel, (dims, _) in CHANNELS.items()}
+
+        # Template recording in progress: (name, channel, [(timestamp, values)])
+        self.recording = None
+
+        # How the last match() call spent its work
+        self.last_stats = {'templates': 0, 'kim_pruned': 0, 'keogh_pruned': 0, 'dtw': 0}
+
+    # Templates
+
+    def add_template(self, name, channel, points, duration, threshold=0.01, builtin=False):
+        """
+        Add a template
+        Args:
+            name: Gesture name reported on a match
+            channel: Key of CHANNELS
+            points: (n, d) samples evenly spaced over `duration` (any scale/position)
+            duration: Seconds the gesture takes; the live window has this length
+            threshold: Maximum mean squared point distance for a match
+        """
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown trajectory channel '{channel}'")
+
+        template = TrajectoryTemplate(name, channel, points, duration, threshold, self.band, builtin)
+        self.templates.append(template)
+        return template
+
+    def add_builtin_templates(self, dynamic_gestures):
+        """Create templates for gesture_data.json dynamic gestures that need them (pinch)"""
+        for name, definition in dynamic_gestures.items():
+            if definition.get('type') != 'pinch':
+                continue
+            ramp = [[1.0], [0.0]] if definition.get('direction') == 'in' else [[0.0], [1.0]]
+            self.add_template(name, 'pinch', ramp, definition.get('duration', 0.4),
+                              definition.get('threshold', 0.01), builtin=True)
+
+    def load_templates(self, path):
+        """Load user templates saved with save_templates()"""
+        if not os.path.exists(path):
+            return 0
+
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)['templates']
+            for entry in entries:
+                self.add_template(entry['name'], entry['channel'], entry['points'],
+                                  entry['duration'], entry.get('threshold', 0.01))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not load gesture templates from {path}: {e}")
+            return 0
+
+        logger.info(f"Loaded {len(entries)} gesture templates from {path}")
+        return len(entries)
+
+    def save_templates(self, path):
+        """Write all user (non built-in) templates as JSON"""
+        with open(path, 'w') as f:
+            json.dump({'templates': [t.to_dict() for t in self.templates if not t.builtin]}, f, indent=2)
+
+    # Recording
+
+    def start_recording(self, name, channel='palm'):
+        """Start capturing the live channel as a new template"""
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown trajectory channel '{channel}'")
+        self.recording = (name, channel, [])
+
+    def stop_recording(self, threshold=0.01):
+        """
+        Finish the recording started with start_recording()
+        Returns:
+            The new TrajectoryTemplate, or None if too little was captured
+        """
+        if self.recording is None:
+            return None
+
+        name, channel, samples = self.recording
+        self.recording = None
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            logger.warning(f"Recording '{name}' too short, discarded")
+            return None
+
+        timestamps = np.array([t for t, _ in samples])
+        values = np.array([v for _, v in samples], dtype=np.float64).reshape(len(samples), -1)
+        grid = np.linspace(timestamps[0], timestamps[-1], TEMPLATE_POINTS)
+        points = np.stack([np.interp(grid, timestamps, values[:, d]) for d in range(values.shape[1])], axis=1)
+
+        return self.add_template(name, channel, points, timestamps[-1] - timestamps[0], threshold)
+
+    # Matching
+
+    def add_sample(self, channel, timestamp, values):
+        """Append one frame of a channel"""
+        self.buffers[channel].add(timestamp, values)
+        if self.recording is not None and self.recording[1] == channel:
+            self.recording[2].append((timestamp, np.array(values, dtype=np.float64)))
+
+    def _query(self, channel, duration):
+        """Normalized live window for a channel, or None if it barely moved"""
+        window = self.buffers[channel].window(duration)
+        if window is None:
+            return None
+
+        timestamps = window[:, 0]
+        grid = np.linspace(timestamps[-1] - duration, timestamps[-1], TEMPLATE_POINTS)
+        raw = np.stack([np.interp(grid, timestamps, window[:, d]) for d in range(1, window.shape[1])], axis=1)
+        if np.ptp(raw, axis=0).max() < CHANNELS[channel][1]:
+            return None
+        return normalize(raw)
+
+    def match(self):
+        """
+        Compare the live trajectories against every template
+        Returns:
+            (gesture_name, confidence) or (None, 0.0)
+        """
+        stats = {'templates': len(self.templates), 'kim_pruned': 0, 'keogh_pruned': 0, 'dtw': 0}
+        self.last_stats = stats
+        if not self.templates or self.recording is not None:
+            return None, 0.0
+
+        # One query per (channel, duration); order candidates by LB_Kim
+        queries = {}
+        candidates = []
+        for template in self.templates:
+            key = (template.channel, template.duration)
+            if key not in queries:
+                queries[key] = self._query(*key)
+            query = queries[key]
+            if query is not None:
+                candidates.append((lb_kim(query, template.points), template, query))
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        best_template = None
+        best_score = float('inf')  # Mean point cost
+        for bound, template, query in candidates:
+            limit = min(best_score, template.threshold) * TEMPLATE_POINTS
+            if bound > limit:
+                stats['kim_pruned'] += 1
+                continue
+            if lb_keogh(query, template.upper, template.lower) > limit:
+                stats['keogh_pruned'] += 1
+                continue
+
+            stats['dtw'] += 1
+            score = dtw_distance(query, template.points, self.band, limit) / TEMPLATE_POINTS
+            if score <= template.threshold and score < best_score:
+                best_template = template
+                best_score = score
+
+        if best_template is None:
+            return None, 0.0
+        return best_template.name, 0.95 - 0.25 * best_score / best_template.threshold
+
+    def reset(self, channel=None):
+        """Drop buffered trajectories (after a gesture fires), or only one channel's"""
+        if channel is not None:
+            self.buffers[channel].reset()
+            return
+        for buffer in self.buffers.values():
+            buffer.reset()
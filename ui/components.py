@@ -4,9 +4,12 @@ UI Components - Clean Modern Design
 
 from PyQt5.QtWidgets import (QFrame, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QTextEdit, QSizePolicy, QWidget, QProgressBar)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QPixmap
-import cv2
+from PyQt5.QtCore import Qt, pyqtSignal, QPointF, QLineF
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QBrush, QColor, QFont
+import numpy as np
+
+from modules.landmarks import HAND_CONNECTIONS
+from utils.profiler import profiler
 
 
 class VideoWidget(QLabel):
@@ -29,16 +32,61 @@ class VideoWidget(QLabel):
         """)
         
         self.setText("📹 Camera Feed\n\nClick 'Start Detection' to begin")
+        
+        # Overlay styles, built once
+        self.connection_pen = QPen(QColor(224, 224, 224), 2)
+        self.landmark_pen = QPen(QColor(255, 255, 255), 1)
+        self.landmark_brush = QBrush(QColor(255, 48, 48))
+        self.landmark_radius = 3.5
+        self.label_pen = QPen(QColor(0, 255, 0))
+        self.label_font = QFont()
+        self.label_font.setPointSize(12)
+        self.label_font.setBold(True)
     
-    def update_frame(self, frame):
+    def update_frame(self, frame, overlays=None):
+        """
+        Show a BGR frame scaled to the widget
+        Args:
+            frame: BGR frame
+            overlays: Optional list of (label, (21, 2) normalized x, y) hands
+        """
         if frame is not None:
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            from PyQt5.QtGui import QImage
-            img = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
+            h, w, ch = frame.shape
+            img = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
             pixmap = QPixmap.fromImage(img)
             scaled = pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            if overlays:
+                with profiler.stage('drawing'):
+                    self._draw_overlays(scaled, overlays)
             self.setPixmap(scaled)
+    
+    def _draw_overlays(self, pixmap, overlays):
+        """Draw hand skeletons onto the display-size pixmap"""
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        size = np.array([pixmap.width(), pixmap.height()], dtype=np.float32)
+        
+        for label, points in overlays:
+            points = [QPointF(x, y) for x, y in (points * size).tolist()]
+            
+            painter.setPen(self.connection_pen)
+            painter.drawLines([QLineF(points[a], points[b]) for a, b in HAND_CONNECTIONS])
+            
+            painter.setPen(self.landmark_pen)
+            painter.setBrush(self.landmark_brush)
+            for point in points:
+                painter.drawEllipse(point, self.landmark_radius, self.landmark_radius)
+            
+            painter.setPen(self.label_pen)
+            painter.setFont(self.label_font)
+            painter.drawText(QPointF(points[0].x(), points[0].y() - 20), label)
+        
+        painter.end()
+    
+    def show_message(self, text):
+        """Replace the video with a status message"""
+        self.clear()
+        self.setText(text)
 
 
 class StatusCard(QFrame):
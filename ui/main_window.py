@@ -220,8 +220,8 @@ class MainWindow(QMainWindow):
     
     # === UPDATE METHODS ===
     
-    def update_video_frame(self, frame):
-        self.video_widget.update_frame(frame)
+    def update_video_frame(self, frame, overlays=None):
+        self.video_widget.update_frame(frame, overlays)
     
     def update_fps(self, fps):
         self.fps_card.update_value(fps)
@@ -243,6 +243,54 @@ class MainWindow(QMainWindow):
         if text:
             self.voice_status.update_text(text)
     
+    def set_camera_status(self, status):
+        """Reflect capture health in the header and video area"""
+        if status == 'lost':
+            self.status_indicator.setText("🟠 CAMERA LOST")
+            self.status_indicator.setStyleSheet("""
+                background: rgba(245, 158, 11, 0.2);
+                color: #f59e0b;
+                padding: 8px 20px;
+                border-radius: 16px;
+                font-size: 12px;
+                font-weight: bold;
+                border: 1px solid rgba(245, 158, 11, 0.5);
+            """)
+            self.video_widget.show_message("📷 Camera lost\n\nReconnecting...")
+        elif status == 'opening':
+            self.video_widget.show_message("📹 Opening camera...")
+        elif status == 'unavailable':
+            self.video_widget.show_message("📷 No camera available\n\nCheck the connection and try again")
+        elif status == 'failed':
+            self.video_widget.show_message("⚠ Hand detection stopped\n\nSee the log for details")
+        elif status == 'healthy':
+            self.set_status(True)
+    
+    def set_model_status(self, state):
+        """Show hand model warm-up progress in the video area"""
+        if state == 'loading':
+            self.video_widget.show_message("⏳ Loading hand model...\n\nYou can start detection at any time")
+        elif state == 'ready':
+            self.video_widget.show_message("📹 Camera Feed\n\nClick 'Start Detection' to begin")
+        elif state == 'failed':
+            self.video_widget.show_message("⚠ Hand model failed to load\n\nSee the log for details")
+    
+    def set_idle(self, idle):
+        """Show idle (low-power) state in the header"""
+        if idle:
+            self.status_indicator.setText("🌙 IDLE")
+            self.status_indicator.setStyleSheet("""
+                background: rgba(99, 102, 241, 0.2);
+                color: #818cf8;
+                padding: 8px 20px;
+                border-radius: 16px;
+                font-size: 12px;
+                font-weight: bold;
+                border: 1px solid rgba(99, 102, 241, 0.5);
+            """)
+        else:
+            self.set_status(True)
+    
     def set_status(self, is_online):
         if is_online:
             self.status_indicator.setText("🟢 ONLINE")
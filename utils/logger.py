@@ -4,6 +4,8 @@ Provides logging functionality for the application
 """
 
 import logging
+import logging.handlers
+import multiprocessing
 import os
 from datetime import datetime
 
@@ -16,6 +18,12 @@ class AppLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
         
+        # Child processes (inference workers, and the re-imported main module
+        # under spawn) must not open a log file of their own; they forward
+        # records to the parent with use_queue()
+        if multiprocessing.parent_process() is not None:
+            return
+        
         # Create logs directory if it doesn't exist
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
@@ -44,6 +52,25 @@ class AppLogger:
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
     
+    def listen(self, log_queue):
+        """
+        Write records that child processes put on log_queue to this
+        process's handlers
+        Returns:
+            QueueListener; call stop() once the children have exited
+        """
+        listener = logging.handlers.QueueListener(
+            log_queue, *self.logger.handlers, respect_handler_level=True
+        )
+        listener.start()
+        return listener
+    
+    def use_queue(self, log_queue):
+        """Send this (child) process's records to the parent's listen() queue"""
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
     def debug(self, message):
         """Log debug message"""
         self.logger.debug(message)
@@ -1,6 +1,7 @@
 
 import numpy as np
-import cv2
+
+# cv2 is imported inside the functions that draw, so importing utils stays cheap
 
 
 def normalize_landmarks(landmarks, width, height):
@@ -85,6 +86,8 @@ def enhance_frame(frame):
     """
     Enhance video frame for better detection
     """
+    import cv2
+    
     # Increase brightness slightly
     enhanced = cv2.convertScaleAbs(frame, alpha=1.1, beta=10)
     
@@ -101,6 +104,8 @@ def draw_info_overlay(frame, fps, gesture, confidence, mode):
     """
     Draw information overlay on frame
     """
+    import cv2
+    
     h, w = frame.shape[:2]
     
     # Semi-transparent overlay
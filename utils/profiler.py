@@ -0,0 +1,173 @@
+"""
+Pipeline Profiler
+Times each stage of the frame pipeline on a monotonic clock and keeps
+rolling p50/p95/p99 statistics, available programmatically and as a
+periodic log summary. Stages are recorded from several threads (processing,
+detector warm-up, GUI drawing), so all statistics access is locked.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.logger import logger
+
+
+class RollingStats:
+    """Fixed-size ring buffer of samples with percentile queries"""
+
+    def __init__(self, window=300):
+        """
+        Args:
+            window: Number of most recent samples kept
+        """
+        self.samples = np.zeros(window, dtype=np.float64)
+        self.count = 0
+        self.index = 0
+
+    def add(self, value):
+        """Add one sample, overwriting the oldest when full"""
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def percentiles(self, q=(50, 95, 99)):
+        """Return the requested percentiles of the samples in the window"""
+        if self.count == 0:
+            return [0.0] * len(q)
+        return np.percentile(self.samples[:self.count], q).tolist()
+
+    def reset(self):
+        self.count = 0
+        self.index = 0
+
+
+class PipelineProfiler:
+    """Per-stage timing with rolling percentiles"""
+
+    def __init__(self, enabled=True, window=300, log_interval=30.0):
+        """
+        Args:
+            enabled: Record timings (disabled stages cost one attribute check)
+            window: Samples kept per stage
+            log_interval: Seconds between log summaries (0 disables them)
+        """
+        self.lock = threading.Lock()
+        self.configure(enabled, window, log_interval)
+
+    def configure(self, enabled=True, window=300, log_interval=30.0):
+        """(Re)configure and clear all statistics"""
+        with self.lock:
+            self.enabled = enabled
+            self.window = window
+            self.log_interval = log_interval
+            self.stats = {}  # stage name -> RollingStats, in first-seen order
+            self.last_log_time = time.monotonic()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one sample of stage `name`"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        """Add a duration (seconds) to a stage"""
+        if not self.enabled:
+            return
+        with self.lock:
+            if name not in self.stats:
+                self.stats[name] = RollingStats(self.window)
+            self.stats[name].add(seconds)
+
+    def summary(self):
+        """
+        Returns:
+            {stage: {'count', 'p50_ms', 'p95_ms', 'p99_ms'}}
+        """
+        result = {}
+        with self.lock:
+            for name, stats in self.stats.items():
+                p50, p95, p99 = stats.percentiles()
+                result[name] = {
+                    'count': stats.count,
+                    'p50_ms': round(p50 * 1000, 3),
+                    'p95_ms': round(p95 * 1000, 3),
+                    'p99_ms': round(p99 * 1000, 3)
+                }
+        return result
+
+    def maybe_log(self, now=None):
+        """Log a summary if log_interval seconds have passed since the last one"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if not self.enabled or not self.log_interval or now - self.last_log_time < self.log_interval:
+                return
+            self.last_log_time = now
+
+        lines = [f"{'stage':<14}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)"]
+        for name, values in self.summary().items():
+            lines.append(
+                f"{name:<14}{values['p50_ms']:>9.2f}{values['p95_ms']:>9.2f}{values['p99_ms']:>9.2f}"
+            )
+        logger.info("Pipeline timing:\n" + "\n".join(lines))
+
+    def reset(self):
+        """Clear all statistics"""
+        with self.lock:
+            self.stats = {}
+
+
+class StartupTimer:
+    """Milestones from process start to window-visible, plus deferred builds"""
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start: time.perf_counter() value to measure from (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.marks = []  # (milestone, seconds since start)
+
+    def mark(self, name):
+        """Record that a startup milestone was reached"""
+        self.marks.append((name, time.perf_counter() - self.start))
+
+    @contextmanager
+    def measure(self, name):
+        """Time a subsystem built after startup (lazy construction)"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            logger.info(f"{name} ready in {(time.perf_counter() - begin) * 1000:.0f} ms")
+
+    def report(self, target=None):
+        """
+        Log the milestone table
+        Args:
+            target: Optional budget in seconds for the last milestone
+        """
+        lines = []
+        previous = 0.0
+        for name, at in self.marks:
+            lines.append(f"{name:<22}{(at - previous) * 1000:>8.0f} ms{at * 1000:>9.0f} ms")
+            previous = at
+        logger.info("Startup timing (step, cumulative):\n" + "\n".join(lines))
+
+        if target is not None and self.marks and self.marks[-1][1] > target:
+            logger.warning(
+                f"Startup took {self.marks[-1][1]:.2f}s (target {target:.2f}s)"
+            )
+
+
+# Create global profiler instance
+profiler = PipelineProfiler()